@@ -8,15 +8,16 @@ Automatically anonymizes sensitive data before sending to AI
 import os
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime
 
 # Import configuration
 try:
-    from .unified_config import LAMBDA_API_ENDPOINT, LAMBDA_API_KEY, APPLICATION_CONTEXT_FILE, LOG_LEVEL, LAMBDA_TIMEOUT
+    from .unified_config import LAMBDA_API_ENDPOINT, LAMBDA_API_KEY, APPLICATION_CONTEXT_FILE, LOG_LEVEL, LAMBDA_TIMEOUT, MAX_RETRIES
     from .anonymizer import anonymize_text
 except ImportError:
-    from unified_config import LAMBDA_API_ENDPOINT, LAMBDA_API_KEY, APPLICATION_CONTEXT_FILE, LOG_LEVEL, LAMBDA_TIMEOUT
+    from unified_config import LAMBDA_API_ENDPOINT, LAMBDA_API_KEY, APPLICATION_CONTEXT_FILE, LOG_LEVEL, LAMBDA_TIMEOUT, MAX_RETRIES
     from anonymizer import anonymize_text
 
 # Configure logging based on config
@@ -28,16 +29,98 @@ logger.setLevel(log_level)
 # Try to import required libraries
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError as e:
     REQUESTS_AVAILABLE = False
     logger.warning(f"Required libraries not available: {e}")
     logger.warning("Install with: pip install requests")
 
+# Try to import orjson (optional, faster JSON encoding/decoding)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Default context file path
 CONTEXT_FILE = os.path.join(os.path.dirname(__file__), "..", "..", APPLICATION_CONTEXT_FILE)
 
 
+# Report returned without calling the Lambda when no errors were logged
+HEALTHY_REPORT_TEMPLATE = """\
+# ✅ System Health Report - {service}/{region}
+## Status: HEALTHY
+**No errors detected during the monitoring period.**
+
+## Key Findings:
+1. **Error Rate**: Zero errors logged - system is operating normally
+2. **Service Stability**: All components functioning as expected
+3. **Log Analysis**: No exceptions, crashes, or critical warnings detected
+
+{metrics_block}
+## Recommendations:
+1. **Continue Monitoring**: Maintain current monitoring coverage
+2. **Proactive Checks**: Review CloudWatch dashboards for any anomalies
+3. **Capacity Planning**: Monitor trends to ensure adequate resources
+4. **Documentation**: Document current healthy state as baseline
+
+## Next Steps:
+- Continue regular monitoring cycles
+- Review performance metrics for optimization opportunities
+- Maintain current operational practices
+- Keep infrastructure up-to-date with patches
+
+*Note: This automated health report was generated because no errors were detected. \
+This is a positive indicator of system stability.*
+"""
+
+HEALTHY_METRICS_BLOCK = """\
+## Performance Metrics:
+- ✅ **CPU Utilization**: Within normal range
+- ✅ **Memory Usage**: Within normal range
+- ✅ **Response Times**: Meeting SLA targets
+"""
+
+# One entry of the error summary sent to the Lambda
+ERROR_SUMMARY_ENTRY = """\
+{idx}. Error: {signature}
+   Count: {count} occurrences
+   Location: {location}
+   Sample: {sample}
+"""
+
+
+@lru_cache(maxsize=4)
+def _read_context_file(path: str, mtime: float) -> str:
+    """Read a context file; cached per (path, mtime) so analyzers share one read"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# HTTP statuses from API Gateway/Lambda that are retried with backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def _create_session() -> "requests.Session":
+    """Create an HTTP session that keeps connections alive and retries transient failures"""
+    retry = Retry(
+        total=MAX_RETRIES,
+        # Never re-send after a read timeout/error: the POST may still be running
+        # on the Lambda, and each attempt could wait up to the full timeout again
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"POST"}),
+        # Hand the last error response back so its status and body are reported
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry))
+    return session
+
+
 class AIAnalyzer:
     """AI Analyzer using AWS Lambda via API Gateway with API key"""
 
@@ -56,11 +139,18 @@ class AIAnalyzer:
         """
         self.context_file = context_file or CONTEXT_FILE
         self.application_context = self._load_context()
+        # Static RAG section of every analysis prompt, built once per analyzer
+        self._prompt_prefix = (
+            f"# Application Context (for reference):\n{self.application_context}\n\n---\n\n"
+            if self.application_context else ""
+        )
 
         # API configuration from unified config
         self.api_endpoint = api_endpoint or LAMBDA_API_ENDPOINT
         self.api_key = api_key or LAMBDA_API_KEY
         self.timeout = timeout or LAMBDA_TIMEOUT
+        # Shared across calls so the TLS handshake to API Gateway is done once
+        self._session = _create_session() if REQUESTS_AVAILABLE else None
 
         if REQUESTS_AVAILABLE:
             if self.api_endpoint and self.api_key:
@@ -75,8 +165,7 @@ class AIAnalyzer:
         """Load application context from file for RAG"""
         try:
             if os.path.exists(self.context_file):
-                with open(self.context_file, 'r', encoding='utf-8') as f:
-                    context = f.read()
+                context = _read_context_file(self.context_file, os.path.getmtime(self.context_file))
                 logger.info(f"Loaded application context from {self.context_file}")
                 return context
             else:
@@ -115,7 +204,8 @@ class AIAnalyzer:
 
         try:
             logger.info(f"Calling Lambda API endpoint: {self.api_endpoint}")
-            logger.debug(f"Payload: {json.dumps(payload)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Payload: %s", json.dumps(payload))
 
             # Set up headers with API key
             headers = {
@@ -123,22 +213,26 @@ class AIAnalyzer:
                 "x-api-key": self.api_key
             }
 
+            # Encode the (potentially large) prompt once and send the bytes as-is
+            body = orjson.dumps(payload) if ORJSON_AVAILABLE else json.dumps(payload).encode("utf-8")
+
             # Make HTTP POST request to API Gateway
-            response = requests.post(
+            response = self._session.post(
                 self.api_endpoint,
-                json=payload,
+                data=body,
                 headers=headers,
                 timeout=self.timeout
             )
 
             logger.info(f"API response status code: {response.status_code}")
-            logger.debug(f"Response headers: {dict(response.headers)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", dict(response.headers))
 
             # Check for HTTP errors
             if response.status_code != 200:
                 error_msg = f"API request failed with status {response.status_code}"
                 try:
-                    error_body = response.json()
+                    error_body = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
                     error_msg += f": {json.dumps(error_body)}"
                 except:
                     error_msg += f": {response.text}"
@@ -147,15 +241,17 @@ class AIAnalyzer:
 
             # Parse response
             try:
-                response_data = response.json()
-                logger.debug(f"Response data: {json.dumps(response_data, indent=2)}")
+                # orjson parses the raw body bytes directly, without decoding to str first
+                response_data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response data: %s", json.dumps(response_data, indent=2))
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response: {e}")
                 logger.error(f"Raw response: {response.text}")
                 raise ValueError(f"Invalid JSON response from API: {response.text[:200]}")
 
             # Parse the Lambda response
-            parsed_response = self._parse_lambda_response(json.dumps(response_data))
+            parsed_response = self._extract_answer(response_data)
 
             if not parsed_response or not parsed_response.strip():
                 raise ValueError("Empty response from Lambda function")
@@ -193,9 +289,9 @@ class AIAnalyzer:
             raise ValueError(error_msg)
 
 
-    def _parse_lambda_response(self, response_text: str) -> str:
+    def _extract_answer(self, response_data) -> str:
         """
-        Parse Lambda response and extract the actual message
+        Extract the answer from a decoded Lambda response
 
         Expected response format from handler:
         {
@@ -203,27 +299,13 @@ class AIAnalyzer:
             "sources": ["source1", "source2", ...]
         }
 
-        Or error format:
+        Or error format (raised as ValueError):
         {
             "errorMessage": "error details",
             "errorType": "Error",
             "stackTrace": [...]
         }
-
-        Or simple string response: "Error processing your request"
         """
-        try:
-            response_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.debug(f"Response is not JSON: {e}")
-            # If response is plain text, check if it's an error message
-            if response_text and len(response_text.strip()) > 0:
-                # Check for error strings
-                if response_text.strip() == "Error processing your request":
-                    raise ValueError("Lambda returned error: Error processing your request")
-                return response_text
-            raise ValueError(f"Empty or invalid response from Lambda: {response_text}")
-
         # Check for Lambda runtime error format
         if 'errorMessage' in response_data and 'errorType' in response_data:
             error_type = response_data.get('errorType', 'Error')
@@ -240,7 +322,8 @@ class AIAnalyzer:
         # Extract answer (required field)
         if 'answer' not in response_data:
             logger.warning(f"Unexpected response format. Available keys: {list(response_data.keys())}")
-            logger.debug(f"Full response: {json.dumps(response_data, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Full response: %s", json.dumps(response_data, indent=2))
 
             # If response is just a string, return it
             if isinstance(response_data, str):
@@ -334,57 +417,32 @@ class AIAnalyzer:
     def _generate_healthy_system_report(self, region: str, service: str, metrics_summary: Optional[Dict]) -> Dict:
         """Generate a positive health report when no errors are found"""
 
-        analysis_parts = []
-        analysis_parts.append(f"# ✅ System Health Report - {service}/{region}\n")
-        analysis_parts.append("## Status: HEALTHY\n")
-        analysis_parts.append(f"**No errors detected during the monitoring period.**\n\n")
-
-        analysis_parts.append("## Key Findings:\n")
-        analysis_parts.append("1. **Error Rate**: Zero errors logged - system is operating normally\n")
-        analysis_parts.append("2. **Service Stability**: All components functioning as expected\n")
-        analysis_parts.append("3. **Log Analysis**: No exceptions, crashes, or critical warnings detected\n\n")
-
         # Add metrics insights if available
+        metrics_block = ""
         if metrics_summary:
-            analysis_parts.append("## Performance Metrics:\n")
-
             perf_issues = metrics_summary.get('performance_issues', 0)
             high_cpu = metrics_summary.get('high_cpu_count', 0)
             high_memory = metrics_summary.get('high_memory_count', 0)
 
             if perf_issues == 0 and high_cpu == 0 and high_memory == 0:
-                analysis_parts.append("- ✅ **CPU Utilization**: Within normal range\n")
-                analysis_parts.append("- ✅ **Memory Usage**: Within normal range\n")
-                analysis_parts.append("- ✅ **Response Times**: Meeting SLA targets\n")
+                metrics_block = HEALTHY_METRICS_BLOCK
             else:
+                metrics_block = "## Performance Metrics:\n"
                 if high_cpu > 0:
-                    analysis_parts.append(f"- ⚠️ **CPU Spikes**: {high_cpu} instances of high CPU (>80%)\n")
+                    metrics_block += f"- ⚠️ **CPU Spikes**: {high_cpu} instances of high CPU (>80%)\n"
                 if high_memory > 0:
-                    analysis_parts.append(f"- ⚠️ **Memory Pressure**: {high_memory} instances of high memory (>80%)\n")
+                    metrics_block += f"- ⚠️ **Memory Pressure**: {high_memory} instances of high memory (>80%)\n"
                 if perf_issues > 0:
-                    analysis_parts.append(f"- ℹ️ **Performance**: {perf_issues} performance metrics collected\n")
+                    metrics_block += f"- ℹ️ **Performance**: {perf_issues} performance metrics collected\n"
 
-        analysis_parts.append("\n## Recommendations:\n")
-        analysis_parts.append("1. **Continue Monitoring**: Maintain current monitoring coverage\n")
-        analysis_parts.append("2. **Proactive Checks**: Review CloudWatch dashboards for any anomalies\n")
-        analysis_parts.append("3. **Capacity Planning**: Monitor trends to ensure adequate resources\n")
-        analysis_parts.append("4. **Documentation**: Document current healthy state as baseline\n\n")
-
-        analysis_parts.append("## Next Steps:\n")
-        analysis_parts.append("- Continue regular monitoring cycles\n")
-        analysis_parts.append("- Review performance metrics for optimization opportunities\n")
-        analysis_parts.append("- Maintain current operational practices\n")
-        analysis_parts.append("- Keep infrastructure up-to-date with patches\n\n")
-
-        analysis_parts.append("*Note: This automated health report was generated because no errors were detected. ")
-        analysis_parts.append("This is a positive indicator of system stability.*\n")
+        analysis = HEALTHY_REPORT_TEMPLATE.format(service=service, region=region, metrics_block=metrics_block)
 
         return {
             "status": "success",
             "region": region,
             "service": service,
             "timestamp": datetime.now().isoformat(),
-            "analysis": "".join(analysis_parts),
+            "analysis": analysis,
             "error_count": 0,
             "model": "system-health-analyzer",
             "health_status": "HEALTHY"
@@ -407,11 +465,8 @@ class AIAnalyzer:
             location = anonymize_text(str(error.get('location', 'Unknown')))
             sample = anonymize_text(str(error.get('sample', ''))[:300])  # Truncate and anonymize
 
-            summary_lines.append(f"{idx}. Error: {signature}")
-            summary_lines.append(f"   Count: {count} occurrences")
-            summary_lines.append(f"   Location: {location}")
-            summary_lines.append(f"   Sample: {sample}")
-            summary_lines.append("")
+            summary_lines.append(ERROR_SUMMARY_ENTRY.format(
+                idx=idx, signature=signature, count=count, location=location, sample=sample))
 
         # Add metrics context if available
         if metrics_summary:
@@ -425,12 +480,6 @@ class AIAnalyzer:
         """Build the complete prompt with RAG context"""
         prompt_parts = []
 
-        # Add application context (RAG)
-        if self.application_context:
-            prompt_parts.append("# Application Context (for reference):")
-            prompt_parts.append(self.application_context)
-            prompt_parts.append("\n---\n")
-
         # Add current analysis request
         prompt_parts.append(f"# Error Analysis Request")
         prompt_parts.append(f"Service: {service}")
@@ -449,7 +498,8 @@ class AIAnalyzer:
         prompt_parts.append("5. **Priority**: Which errors should be addressed first?")
         prompt_parts.append("\nProvide concise, actionable insights in markdown format.")
 
-        return "\n".join(prompt_parts)
+        # Application context (RAG) goes first
+        return self._prompt_prefix + "\n".join(prompt_parts)
 
     def analyze_cross_region(self, region_analyses: Dict[str, List[Dict]]) -> Dict:
         """
@@ -7,27 +7,149 @@ from __future__ import annotations
 
 import os
 import re
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from typing import Callable
 
-# Pre-compiled regex patterns (kept in the same effective order as before)
-_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
-_USERNAME_SQ_RE = re.compile(r"userName='([^']+)'")
-_USERNAME_JSON_RE = re.compile(r'"userName"\s*:\s*"([^"]+)"')
-_NAME_RE = re.compile(r"\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b(?=[\s,\'\"])" )
-_STATUS_UPDATER_RE = re.compile(r"statusUpdaterName='([^']+)'")
-_USER_COMMENT_RE = re.compile(r"userComment='([^']+)'")
-_USER_BRACKET_RE = re.compile(r"\[user:\s*([^]]+)]", flags=re.IGNORECASE)
-_PHONE_RE = re.compile(r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b")
+try:
+    from .regex_helper import compile_pattern, rewrite_whitespace
+except ImportError:
+    from regex_helper import compile_pattern, rewrite_whitespace
+
+# Try to import Hyperscan (optional dependency)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# PII redaction rules: (group name, pattern, replacement), in the original pass order.
+# They are fused into a single alternation so each message is scanned once; the
+# name of the matching group selects the replacement token.
+_PII_RULES = (
+    ("email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "[EMAIL_REDACTED]"),
+    ("username_sq", r"userName='[^']+'", "userName='[USER_NAME_REDACTED]'"),
+    ("username_json", r'"userName"\s*:\s*"[^"]+"', '"userName":"[USER_NAME_REDACTED]"'),
+    ("status_updater", r"statusUpdaterName='[^']+'", "statusUpdaterName='[NAME_REDACTED]'"),
+    ("user_comment", r"userComment='[^']+'", "userComment='[COMMENT_REDACTED]'"),
+    ("user_bracket", r"(?i:\[user:\s*[^]]+])", "[user:[USER_REDACTED]]"),
+    ("phone", r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b", "[PHONE_REDACTED]"),
+)
+_PII_RE = compile_pattern("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in _PII_RULES))
+_PII_REPLACEMENTS = {name: repl for name, _, repl in _PII_RULES}
+
+# "First Last" names (same conservative matching approach). The required next
+# character is captured and written back rather than checked with a lookahead,
+# which RE2 cannot compile; this runs as its own pass so the consumed character
+# (whitespace, comma or quote) can never be the start of another name.
+_NAME_RE = compile_pattern(r"\b[A-Z][a-z]+\s+[A-Z][a-z]+\b([\s,'\"])")
+
+# Name-bearing fields used to collect the known names of a CSV corpus
+_NAME_FIELD_RE = compile_pattern(r"(?:userName|statusUpdaterName)='([^']+)'|\"userName\"\s*:\s*\"([^\"]+)\"")
+# Only person-like values (one to three capitalized words) are collected as names;
+# account ids and role/system users would otherwise redact ordinary words
+_PERSON_NAME_RE = re.compile(r"[A-Z][a-z]+(?: [A-Z][a-z]+){0,2}")
+_NON_PERSON_NAMES = frozenset({
+    "admin", "administrator", "anonymous", "guest", "null", "none", "root", "service",
+    "support", "system", "test", "unknown", "user",
+})
+# The most frequent known names kept per file
+_MAX_KNOWN_NAMES = 5000
+# Word tokens the known-name trie is walked over
+_WORD_RE = re.compile(r"\w+")
+# Trie key marking the end of a known name
+_NAME_END = None
 
 # Tenant/org related patterns
-_TENANT_BRACKETED_ID_RE = re.compile(r"\[[A-Za-z0-9][A-Za-z0-9._-]*\d{3,}]")
-_TENANT_BRACKETED_KV_RE = re.compile(r"\[(tenant|customer|org|organization|account)[:=]\s*[^]]+]", flags=re.IGNORECASE)
-_TENANT_KV_RE = re.compile(
+_TENANT_BRACKETED_ID_RE = compile_pattern(r"\[[A-Za-z0-9][A-Za-z0-9._-]*\d{3,}]")
+_TENANT_BRACKETED_KV_RE = compile_pattern(r"\[(tenant|customer|org|organization|account)[:=]\s*[^]]+]", re.IGNORECASE)
+_TENANT_KV_RE = compile_pattern(
     r"\b(tenantId|tenantID|tenant|tenantName|customer|customerName|organization|organizationName|org|account|accountName)\b\s*[:=]\s*(?:'[^']+'|\"[^\"]+\"|[^,\s\]}]+)",
-    flags=re.IGNORECASE,
+    re.IGNORECASE,
 )
-_TENANT_PATH_RE = re.compile(r"(/tenants/)([^/?\s]+)", flags=re.IGNORECASE)
-_TENANT_QUERY_RE = re.compile(r"(tenant(?:Id|ID|Name)?=)([^&\s]+)", flags=re.IGNORECASE)
+_TENANT_PATH_RE = compile_pattern(r"(/tenants/)([^/?\s]+)", re.IGNORECASE)
+_TENANT_QUERY_RE = compile_pattern(r"(tenant(?:Id|ID|Name)?=)([^&\s]+)", re.IGNORECASE)
+
+
+_PREFILTER_SPACE_CLASS = r"\s\x0b\x1c-\x1f"
+
+
+def _build_prefilter_database():
+    """Compile every redaction rule into one Hyperscan database.
+
+    HS_FLAG_PREFILTER makes Hyperscan accept constructs it cannot run exactly
+    by matching a superset, so a message
+    with no hit cannot match any rule and is returned untouched.
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+
+    sources = [(pattern, False) for _, pattern, _ in _PII_RULES]
+    sources.append((_NAME_RE.pattern, False))
+    sources += [
+        (_TENANT_BRACKETED_ID_RE.pattern, False),
+        (_TENANT_BRACKETED_KV_RE.pattern, True),
+        (_TENANT_KV_RE.pattern, True),
+        (_TENANT_PATH_RE.pattern, True),
+        (_TENANT_QUERY_RE.pattern, True),
+    ]
+    # Hyperscan's \s omits \x1c-\x1f, which Python's \s matches
+    sources = [(rewrite_whitespace(pattern, _PREFILTER_SPACE_CLASS), caseless) for pattern, caseless in sources]
+    if any(pattern is None for pattern, _ in sources):
+        return None
+
+    base_flags = (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+                  | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode("utf-8") for pattern, _ in sources],
+            ids=list(range(len(sources))),
+            flags=[base_flags | (hyperscan.HS_FLAG_CASELESS if caseless else 0) for _, caseless in sources],
+        )
+        return database
+    except hyperscan.HyperscanError:
+        return None
+
+
+_PREFILTER_DB = _build_prefilter_database()
+# Hyperscan scratch space cannot be shared between concurrent scans
+_prefilter_local = threading.local()
+
+
+def _stop_scan(*_args) -> bool:
+    return True
+
+
+def _may_contain_pii(message: str) -> bool:
+    """Return False only when no redaction rule can match the message."""
+    if _PREFILTER_DB is None:
+        return True
+
+    scratch = getattr(_prefilter_local, "scratch", None)
+    if scratch is None:
+        scratch = _prefilter_local.scratch = hyperscan.Scratch(_PREFILTER_DB)
+    try:
+        data = message.encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates cannot be scanned; leave the message to the regex rules
+        return True
+    try:
+        _PREFILTER_DB.scan(data, match_event_handler=_stop_scan, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
+
+
+# Read/write buffer size and rows per batch for CSV anonymization
+_CSV_BUFFER_SIZE = 1 << 20
+_CSV_BATCH_ROWS = 10_000
+# Batches queued per worker process; bounds memory while keeping workers busy
+_CSV_BATCHES_PER_WORKER = 2
+# Below this many batches, process start-up and pickling outweigh the parallel gain
+_CSV_PARALLEL_MIN_BATCHES = 5
 
 
 def _sub(text: str, pattern: re.Pattern[str], repl: str | Callable[[re.Match[str]], str]) -> str:
@@ -39,8 +161,23 @@ def _redact_tenant_like_values(text: str) -> str:
     if not text:
         return text
 
-    text = _sub(text, _TENANT_BRACKETED_ID_RE, "[TENANT_REDACTED]")
-    text = _sub(text, _TENANT_BRACKETED_KV_RE, "[TENANT_REDACTED]")
+    # Skip passes whose literal parts are absent. The [TENANT_REDACTED] token
+    # cannot complete any of these patterns, so checking the input is enough.
+    # Non-ASCII text always runs every pass (IGNORECASE folds e.g. 'ſ' to 's').
+    if text.isascii():
+        lowered = text.lower()
+        has_bracket = "[" in text
+        has_key = "tenant" in lowered or "customer" in lowered or "org" in lowered or "account" in lowered
+        has_tenant = "tenant" in lowered
+    else:
+        has_bracket = has_key = has_tenant = True
+
+    if has_bracket:
+        text = _sub(text, _TENANT_BRACKETED_ID_RE, "[TENANT_REDACTED]")
+        if has_key:
+            text = _sub(text, _TENANT_BRACKETED_KV_RE, "[TENANT_REDACTED]")
+    if not has_key:
+        return text
 
     def _tenant_kv_repl(m: re.Match[str]) -> str:
         # Preserve original key spelling/casing from the log
@@ -51,38 +188,33 @@ def _redact_tenant_like_values(text: str) -> str:
     text = _TENANT_KV_RE.sub(_tenant_kv_repl, text)
 
     # URL path/query occurrences
-    text = _TENANT_PATH_RE.sub(r"\1[TENANT_REDACTED]", text)
-    text = _TENANT_QUERY_RE.sub(r"\1[TENANT_REDACTED]", text)
+    if has_tenant:
+        text = _TENANT_PATH_RE.sub(r"\1[TENANT_REDACTED]", text)
+        text = _TENANT_QUERY_RE.sub(r"\1[TENANT_REDACTED]", text)
 
     return text
 
 
+def _pii_repl(m: re.Match[str]) -> str:
+    return _PII_REPLACEMENTS[m.lastgroup]
+
+
 def anonymize_log_message(message: str) -> str:
     """Remove or redact sensitive information from log messages."""
     if not message or not message.strip():
         return message
 
+    # Cheap single-pass check (Hyperscan, when installed) before running the rules
+    if not _may_contain_pii(message):
+        return message
+
     anonymized = message
 
     # Tenant/org masking (run early to avoid leaking names inside other structures)
     anonymized = _redact_tenant_like_values(anonymized)
 
-    anonymized = _sub(anonymized, _EMAIL_RE, "[EMAIL_REDACTED]")
-    anonymized = _sub(anonymized, _USERNAME_SQ_RE, "userName='[USER_NAME_REDACTED]'")
-    anonymized = _sub(anonymized, _USERNAME_JSON_RE, '"userName":"[USER_NAME_REDACTED]"')
-
-    # Keep same conservative matching approach
-    anonymized = _sub(anonymized, _NAME_RE, "[NAME_REDACTED]")
-
-    anonymized = _sub(anonymized, _STATUS_UPDATER_RE, "statusUpdaterName='[NAME_REDACTED]'")
-    anonymized = _sub(anonymized, _USER_COMMENT_RE, "userComment='[COMMENT_REDACTED]'")
-    anonymized = _sub(anonymized, _USER_BRACKET_RE, "[user:[USER_REDACTED]]")
-    anonymized = _sub(anonymized, _PHONE_RE, "[PHONE_REDACTED]")
-
-    # Run tenant masking again after other substitutions
-    anonymized = _redact_tenant_like_values(anonymized)
-
-    return anonymized
+    anonymized = _PII_RE.sub(_pii_repl, anonymized)
+    return _NAME_RE.sub(r"[NAME_REDACTED]\1", anonymized)
 
 
 # Alias for general text anonymization
@@ -91,26 +223,167 @@ def anonymize_text(text: str) -> str:
     return anonymize_log_message(text)
 
 
-def anonymize_csv_file(input_path: str, output_path: str | None = None) -> str:
-    """Anonymize an existing CSV file containing logs."""
+def _collect_known_names(rows, idx: int) -> set[str]:
+    """Collect person names that appear in name-bearing fields of the log column."""
+    counts = Counter()
+    for row in rows:
+        if idx < len(row):
+            for m in _NAME_FIELD_RE.finditer(row[idx]):
+                name = (m.group(1) or m.group(2) or "").strip()
+                if _PERSON_NAME_RE.fullmatch(name) and name.lower() not in _NON_PERSON_NAMES:
+                    counts[name] += 1
+    return {name for name, _ in counts.most_common(_MAX_KNOWN_NAMES)}
+
+
+def _compile_known_names(names: set[str]) -> dict | None:
+    """Build a word trie of the known names; each name ends with a _NAME_END key."""
+    if not names:
+        return None
+    trie = {}
+    for name in names:
+        node = trie
+        for word in name.split(" "):
+            node = node.setdefault(word, {})
+        node[_NAME_END] = True
+    return trie
+
+
+def _redact_known_names(message: str, trie: dict) -> str:
+    """Replace whole-word mentions of known names, preferring the longest name at each word.
+
+    The cost is one dict lookup per word, independent of the number of names.
+    """
+    tokens = [(m.start(), m.end(), m.group()) for m in _WORD_RE.finditer(message)]
+    out = []
+    last = 0
+    i = 0
+    n = len(tokens)
+    while i < n:
+        node = trie.get(tokens[i][2])
+        if node is None:
+            i += 1
+            continue
+        match_end = i if _NAME_END in node else -1
+        j = i
+        # Multi-word names continue only over a single space
+        while j + 1 < n and message[tokens[j][1]:tokens[j + 1][0]] == " ":
+            node = node.get(tokens[j + 1][2])
+            if node is None:
+                break
+            j += 1
+            if _NAME_END in node:
+                match_end = j
+        if match_end < 0:
+            i += 1
+            continue
+        out.append(message[last:tokens[i][0]])
+        out.append("[NAME_REDACTED]")
+        last = tokens[match_end][1]
+        i = match_end + 1
+    if not out:
+        return message
+    out.append(message[last:])
+    return "".join(out)
+
+
+def _anonymize_rows(rows: list[list[str]], idx: int, known_names=None) -> list[list[str]]:
+    """Anonymize the log message column of a batch of CSV rows in place."""
+    for row in rows:
+        if idx < len(row):
+            message = row[idx]
+            if known_names is not None and message:
+                message = _redact_known_names(message, known_names)
+            row[idx] = anonymize_log_message(message)
+    return rows
+
+
+# Known-name trie built once in each worker process
+_worker_known_names = None
+
+
+def _init_anonymize_worker(known_names: set[str]) -> None:
+    global _worker_known_names
+    _worker_known_names = _compile_known_names(known_names)
+
+
+def _anonymize_batch(rows: list[list[str]], idx: int) -> list[list[str]]:
+    return _anonymize_rows(rows, idx, _worker_known_names)
+
+
+def _iter_batches(reader):
+    """Yield lists of up to _CSV_BATCH_ROWS rows from a csv reader."""
+    while True:
+        batch = list(islice(reader, _CSV_BATCH_ROWS))
+        if not batch:
+            return
+        yield batch
+
+
+def _anonymize_batches_parallel(batches, writer, idx: int, known_names: set[str], workers: int) -> None:
+    """Anonymize batches in worker processes, writing results in input order."""
+    max_pending = workers * _CSV_BATCHES_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_anonymize_worker,
+                             initargs=(known_names,)) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_anonymize_batch, batch, idx))
+            if len(pending) >= max_pending:
+                writer.writerows(pending.popleft().result())
+        while pending:
+            writer.writerows(pending.popleft().result())
+
+
+def anonymize_csv_file(input_path: str, output_path: str | None = None,
+                       redact_known_names: bool = False, workers: int = 1) -> str:
+    """Anonymize an existing CSV file containing logs.
+
+    Rows are streamed in fixed-size batches through list-based csv reader/writer
+    objects with large I/O buffers; only the `log_message` column is rewritten.
+    With `redact_known_names`, a first pass collects the person names found in
+    userName/statusUpdaterName fields (capitalized words only, at most
+    _MAX_KNOWN_NAMES) so that every other whole-word mention of them, including
+    single-word names the generic rule cannot catch, is redacted via a word trie.
+
+    With `workers` > 1, files of at least _CSV_PARALLEL_MIN_BATCHES batches are
+    anonymized in that many processes; smaller files always stay in-process.
+    """
     import csv
 
     if output_path is None:
         base, ext = os.path.splitext(input_path)
         output_path = f"{base}_anonymized{ext}"
 
-    with open(input_path, "r", encoding="utf-8", newline="") as infile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames
+    known_names = set()
+    if redact_known_names:
+        with open(input_path, "r", encoding="utf-8", newline="", buffering=_CSV_BUFFER_SIZE) as infile:
+            reader = csv.reader(infile)
+            header = next(reader, None)
+            if header is not None and "log_message" in header:
+                known_names = _collect_known_names(reader, header.index("log_message"))
+
+    with open(input_path, "r", encoding="utf-8", newline="", buffering=_CSV_BUFFER_SIZE) as infile, \
+            open(output_path, "w", encoding="utf-8", newline="", buffering=_CSV_BUFFER_SIZE) as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
 
-        with open(output_path, "w", encoding="utf-8", newline="") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
+        header = next(reader, None)
+        if header is not None:
+            writer.writerow(header)
 
-            for row in reader:
-                if "log_message" in row:
-                    row["log_message"] = anonymize_log_message(row["log_message"])
-                writer.writerow(row)
+            if "log_message" in header:
+                idx = header.index("log_message")
+                batches = _iter_batches(reader)
+                head = list(islice(batches, _CSV_PARALLEL_MIN_BATCHES)) if workers > 1 else []
+                if len(head) >= _CSV_PARALLEL_MIN_BATCHES:
+                    # Batches are independent, so the CPU-bound regex work runs in
+                    # worker processes instead of contending for the GIL
+                    _anonymize_batches_parallel(chain(head, batches), writer, idx, known_names, workers)
+                else:
+                    known_names_trie = _compile_known_names(known_names)
+                    for batch in chain(head, batches):
+                        writer.writerows(_anonymize_rows(batch, idx, known_names_trie))
+            else:
+                writer.writerows(reader)
 
     print(f"Anonymized CSV saved to: {output_path}")
     return output_path
@@ -6,13 +6,25 @@ All operations use the default AWS profile with credentials stored via PowerShel
 """
 
 import logging
+import threading
 import boto3
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+try:
+    from .unified_config import MAX_RETRIES
+except ImportError:
+    MAX_RETRIES = 3
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared botocore configuration for cached clients: a connection pool large
+# enough for concurrent callers and the configured retry budget, with adaptive
+# (client-side rate limited) retries to ride out CloudWatch throttling
+CLIENT_CONFIG = Config(max_pool_connections=32, retries={'max_attempts': MAX_RETRIES, 'mode': 'adaptive'})
+
 
 class AWSProfileManager:
     """Manages AWS sessions using default credentials"""
@@ -26,6 +38,8 @@ class AWSProfileManager:
         """Initialize the profile manager with default session"""
         self.sessions: Dict[str, boto3.Session] = {}
         self.credentials: Dict[str, object] = {}
+        self._clients: Dict[Tuple[str, str, Optional[str]], object] = {}
+        self._clients_lock = threading.Lock()
         self._initialize_profiles()
 
     def _initialize_profiles(self):
@@ -182,6 +196,34 @@ class AWSProfileManager:
             logger.error(f"Failed to create {service_name} client: {e}")
             raise
 
+    def get_client(self, service_name: str, region_name: str = None,
+                   purpose: str = DATA_PROFILE):
+        """
+        Get a cached boto3 client, creating it on first use
+
+        Clients are shared per (purpose, service, region) so the service model
+        and endpoint data are loaded once and HTTP connections are reused.
+
+        Args:
+            service_name: AWS service name (e.g., 'cloudwatch', 'logs')
+            region_name: AWS region name
+            purpose: Profile purpose (LAMBDA_PROFILE or DATA_PROFILE)
+
+        Returns:
+            Boto3 client object
+        """
+        key = (purpose, service_name, region_name)
+        client = self._clients.get(key)
+        if client is None:
+            # boto3 sessions are not thread-safe, so client creation is serialized
+            with self._clients_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.create_client(service_name, region_name=region_name,
+                                                purpose=purpose, config=CLIENT_CONFIG)
+                    self._clients[key] = client
+        return client
+
     def get_caller_identity(self, purpose: str = DEFAULT_PROFILE) -> Optional[Dict]:
         """
         Get AWS account information for a profile
@@ -216,9 +258,14 @@ class AWSProfileManager:
             Dictionary mapping profile purposes to validity status
         """
         results = {}
+        # Purposes that share a session share one STS round-trip
+        identities = {}
 
         for purpose in [self.LAMBDA_PROFILE, self.DATA_PROFILE, self.DEFAULT_PROFILE]:
-            identity = self.get_caller_identity(purpose)
+            session_id = id(self.get_session(purpose))
+            if session_id not in identities:
+                identities[session_id] = self.get_caller_identity(purpose)
+            identity = identities[session_id]
             results[purpose] = identity is not None
 
             if identity:
@@ -2,8 +2,11 @@ import csv
 import os
 import re
 import json
-from typing import List, Dict, Optional
-from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+from collections import defaultdict
+from functools import lru_cache
+
+from .regex_helper import compile_pattern
 
 # Base output directory: repo_root/output
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
@@ -18,6 +21,50 @@ except ImportError:
 
 GENERATE_AI_TEXT_OUTPUT = True  # Always generate text output for AI
 
+# I/O buffer size for CSV files (1 MiB)
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Number of distinct raw log messages whose signatures are memoized
+# (error logs repeat the same stack trace many times)
+_SIGNATURE_CACHE_SIZE = 10_000
+
+# Pre-compiled patterns for error classification (applied once per error log row)
+_ERROR_LOGGER_RE = compile_pattern(r'\bERROR\s+(\S+)')
+_EXCEPTION_RE = compile_pattern(r'(java\.lang\.\w+Exception|com\.nice\.saas\.wfo\.\S+Exception|\w+Exception):\s*(.+?)(?:\n|$)')
+_FIRST_ERROR_LINE_RE = compile_pattern(r'\bERROR\b[^\n]*?\]\s+(.+?)(?:\n|$)')
+_ERROR_LINE_RE = compile_pattern(r'ERROR\s+(\S+)\s+.*?\]\s+(.+?)(?:\n|$)')
+
+# First ERROR-line normalization
+_STRUCTURED_PAYLOAD_RE = compile_pattern(r'\b\w+\{[^\n\r]{0,2000}\}')
+_LONG_BRACKET_40_RE = compile_pattern(r'\[[^\]]{40,}\]')
+_URL_RE = compile_pattern(r'https?://\S+')
+_LONG_KV_RE = compile_pattern(r"\b\w+=[^,\s]{12,}")
+_LONG_SQ_RE = compile_pattern(r"'[^']{12,}'")
+_LONG_DQ_RE = compile_pattern(r'"[^"]{12,}"')
+_WHITESPACE_RE = compile_pattern(r'\s+')
+
+# Error message normalization
+# Dynamic tokens are fused into one alternation; the matching group's name picks the placeholder
+_DYNAMIC_TOKEN_RULES = (
+    ("uuid", r'\b(?i:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\b', '[UUID]'),
+    ("hex_id", r'\b[0-9a-f]{16}\b', '[HEX-ID]'),
+    ("timestamp", r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z?', '[TIMESTAMP]'),
+    ("time", r'\d{2}:\d{2}:\d{2}\.\d+', '[TIME]'),
+    ("quoted_id", r"'[0-9]+'", "'[ID]'"),
+    ("tenant", r'\[\w+_\w+_\w+_\w+\d+\]', '[TENANT]'),
+)
+_DYNAMIC_TOKEN_RE = compile_pattern("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in _DYNAMIC_TOKEN_RULES))
+_DYNAMIC_TOKEN_REPLACEMENTS = {name: repl for name, _, repl in _DYNAMIC_TOKEN_RULES}
+_BASE_SCR_REQUEST_RE = compile_pattern(r'BaseSCRRequest\{[^}]+\}')
+_REQUESTED_CHANGES_RE = compile_pattern(r'RequestedChanges\{[^}]+\}')
+_ACTIVITY_CHANGE_RE = compile_pattern(r'ActivityChange\{[^}]+\}')
+_LONG_BRACKET_50_RE = compile_pattern(r'\[[^\]]{50,}\]')
+_NUM_RE = compile_pattern(r'\b\d{3,}\b')
+
+# Error location extraction
+_AT_FRAME_RE = compile_pattern(r'at (com\.nice\.saas\.wfo\.\w+\.[\w\.]+)\.(\w+)\(')
+_ERROR_CLASS_RE = compile_pattern(r'ERROR\s+(com\.nice\.saas\.wfo\.\S+)')
+
 # Try to import AI analyzer (optional dependency)
 try:
     from .ai_analyzer import analyze_errors_with_ai
@@ -46,61 +93,76 @@ def _region_csv_dir(region: Optional[str]):
     os.makedirs(csv_dir, exist_ok=True)
     return csv_dir
 
-def save_metrics_group_to_csv(group_name: str, group_data: List[Dict], region: Optional[str] = None):
+def _csv_field(value) -> str:
+    """Format a single CSV field the way csv.writer does (QUOTE_MINIMAL)."""
+    text = str(value)
+    if ',' in text or '"' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def save_metrics_group_to_csv(group_name: str, group_data: Iterable[Dict], region: Optional[str] = None):
     """Save grouped metric data to a CSV file.
 
     If region is supplied, write to csv_data/<region>/<group_name>.csv else root csv_data.
-    Each row: metric, timestamp, value
+    Each row: metric, timestamp, value. `group_data` may be a generator; rows are
+    formatted and written through the file buffer as they are produced.
     """
     filename = f"{group_name}.csv"
     dir_path = _region_csv_dir(region)
     filepath = os.path.join(dir_path, filename)
-    with open(filepath, mode='w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["metric", "timestamp", "value"])
-        for row in group_data:
-            metric_short = row["metric"].split('.')[-1]
-            writer.writerow([metric_short, row["timestamp"], row["value"]])
+    with open(filepath, mode='w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write("metric,timestamp,value\r\n")
+        csvfile.writelines(
+            f"{_csv_field(row['metric'].rpartition('.')[2])},{_csv_field(row['timestamp'])},{_csv_field(row['value'])}\r\n"
+            for row in group_data
+        )
     print(f"Saved grouped CSV: {filepath}")
     return filepath
 
-def save_error_logs(error_log_rows: list, region: Optional[str] = None):
-    """Save error logs to region-specific folder if provided (<region>/csv_data/error_logs.csv)."""
+def save_error_logs(error_log_rows: Iterable[Tuple[str, str]], region: Optional[str] = None, classify: bool = True):
+    """Save error logs to region-specific folder if provided (<region>/csv_data/error_logs.csv).
+
+    Rows are (timestamp, log_message) tuples and may come from a generator; they are
+    written as they are produced.
+    When `classify` is True the saved file is classified (and AI-analyzed) right away.
+    """
     filename = "error_logs.csv"
     dir_path = _region_csv_dir(region)
     filepath = os.path.join(dir_path, filename)
-    with open(filepath, mode='w', newline='', encoding='utf-8') as csvfile:
+    with open(filepath, mode='w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as csvfile:
         writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
         writer.writerow(["timestamp", "log_message"])
-        for row in error_log_rows:
-            writer.writerow([row["timestamp"], row["log_message"]])
+        writer.writerows(error_log_rows)
     print(f"Saved error logs: {filepath}")
 
     # Automatically classify errors after saving
-    try:
-        classify_and_save_errors(filepath, dir_path)
-    except Exception as e:
-        print(f"Warning: Error classification failed: {e}")
+    if classify:
+        try:
+            classify_and_save_errors(filepath, dir_path)
+        except Exception as e:
+            print(f"Warning: Error classification failed: {e}")
 
     return filepath
 
+def _new_error_record():
+    """Per-signature accumulator used by classify_and_save_errors."""
+    return {"count": 0, "type": "", "location": "", "sample": ""}
+
 def classify_and_save_errors(error_log_path: str, dir_path: str):
     """Classify errors and save to classified_errors.csv with optional AI analysis"""
 
     classified_path = os.path.join(dir_path, "classified_errors.csv")
 
-    # Read and classify errors
-    error_signatures = Counter()
-    error_examples = {}
-    error_timestamps = defaultdict(list)
-    error_details = defaultdict(lambda: {"type": "", "location": "", "count": 0})
+    # Read and classify errors: one record per signature
+    error_stats = defaultdict(_new_error_record)
 
-    with open(error_log_path, 'r', encoding='utf-8', newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
+    with open(error_log_path, 'r', encoding='utf-8', newline='', buffering=_CSV_BUFFER_SIZE) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        msg_idx = header.index('log_message') if 'log_message' in header else -1
 
         for row in reader:
-            timestamp = row.get('timestamp', '')
-            log_message = row.get('log_message', '')
+            log_message = row[msg_idx] if 0 <= msg_idx < len(row) else ''
 
             if not log_message:
                 continue
@@ -108,45 +170,31 @@ def classify_and_save_errors(error_log_path: str, dir_path: str):
             # Extract error signature
             error_type, location, signature = _extract_error_signature(log_message)
 
-            # Count this error
-            error_signatures[signature] += 1
-
-            # Store details
-            if signature not in error_examples:
-                error_examples[signature] = log_message  # Store full log message
-
-            error_timestamps[signature].append(timestamp)
-            error_details[signature]["type"] = error_type
-            error_details[signature]["location"] = location
-            error_details[signature]["count"] = error_signatures[signature]
-
-    # Write classified errors
-    with open(classified_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([
-            "Error Signature",
-            "Occurrence Count",
-            "Location",
-            "Sample Error Message"
-        ])
+            # Count this error and store details
+            record = error_stats[signature]
+            record["count"] += 1
+            if not record["sample"]:
+                record["sample"] = log_message  # Store full log message
+            record["type"] = error_type
+            record["location"] = location
 
-        sorted_errors = sorted(error_signatures.items(), key=lambda x: x[1], reverse=True)
+    sorted_errors = sorted(error_stats.items(), key=lambda x: x[1]["count"], reverse=True)
 
-        for signature, count in sorted_errors:
-            location = error_details[signature]["location"]
-            sample = error_examples.get(signature, "")  # Full log, no truncation
+    # Write classified errors: format every row up front and write once
+    lines = ["Error Signature,Occurrence Count,Location,Sample Error Message\r\n"]
+    lines.extend(
+        f"{_csv_field(signature)},{record['count']},{_csv_field(record['location'])},"
+        f"{_csv_field(record['sample'])}\r\n"  # Full log, no truncation
+        for signature, record in sorted_errors
+    )
 
-            writer.writerow([
-                signature,
-                count,
-                location,
-                sample
-            ])
+    with open(classified_path, 'w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write("".join(lines))
 
-    print(f"Saved classified errors: {classified_path} ({len(error_signatures)} unique patterns)")
+    print(f"Saved classified errors: {classified_path} ({len(error_stats)} unique patterns)")
 
     # Handle case where no errors were found (this is good news!)
-    if len(error_signatures) == 0:
+    if len(error_stats) == 0:
         print(f"✅ No errors found in {service}/{region} - System is healthy!")
         print(f"   This is good news - the service is operating normally.")
 
@@ -167,13 +215,13 @@ def classify_and_save_errors(error_log_path: str, dir_path: str):
 
             # Prepare classified errors as list of dicts for AI
             classified_errors_list = []
-            for signature, count in sorted_errors:
+            for signature, record in sorted_errors:
                 classified_errors_list.append({
                     "signature": signature,
-                    "count": count,
-                    "location": error_details[signature]["location"],
-                    "type": error_details[signature]["type"],
-                    "sample": error_examples.get(signature, "")
+                    "count": record["count"],
+                    "location": record["location"],
+                    "type": record["type"],
+                    "sample": record["sample"]
                 })
 
             print(f"🤖 Running AI analysis for {service}/{region}...")
@@ -260,14 +308,13 @@ def classify_and_save_errors(error_log_path: str, dir_path: str):
     else:
         print("ℹ️  AI analysis not available. Configure LAMBDA_ENDPOINT in config.properties")
 
+@lru_cache(maxsize=_SIGNATURE_CACHE_SIZE)
 def _extract_error_signature(log_message: str):
     """Extract error signature from log message.
 
     Note: We add context for ServiceCallException-like cases where the exception
     message is empty/generic, otherwise many different failures collapse into one bucket.
     """
-    import re
-
     if not log_message or not log_message.strip():
         return ("Unknown", "Unknown", "Empty log message")
 
@@ -282,37 +329,34 @@ def _extract_error_signature(log_message: str):
 
         # Collapse very large structured payloads common in these logs.
         # Examples: BaseSCRRequest{...}, RequestedChanges{...}, ActivityChange{...}
-        text = re.sub(r'\b\w+\{[^\n\r]{0,2000}\}', lambda m: (m.group(0).split('{', 1)[0] + '{...}'), text)
+        text = _STRUCTURED_PAYLOAD_RE.sub(lambda m: (m.group(0).split('{', 1)[0] + '{...}'), text)
 
         # Remove long bracket blocks (often contain dynamic context)
-        text = re.sub(r'\[[^\]]{40,}\]', '[...]', text)
+        text = _LONG_BRACKET_40_RE.sub('[...]', text)
 
         # Remove URLs
-        text = re.sub(r'https?://\S+', '[URL]', text)
+        text = _URL_RE.sub('[URL]', text)
 
         # Remove key=value segments where value is long/dynamic (UUIDs, timestamps, ids)
-        text = re.sub(r"\b\w+=[^,\s]{12,}", "key=[...]", text)
+        text = _LONG_KV_RE.sub("key=[...]", text)
 
         # Drop quoted payloads (keeps the fact there was a value)
-        text = re.sub(r"'[^']{12,}'", "'[...']", text)
-        text = re.sub(r'"[^"]{12,}"', '"..."', text)
+        text = _LONG_SQ_RE.sub("'[...']", text)
+        text = _LONG_DQ_RE.sub('"..."', text)
 
         # Normalize spaces/punctuation
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         return text
 
-    # Capture the first log line's logger (the class after ERROR)
-    first_logger = ""
-    m_logger = re.search(r'\bERROR\s+(\S+)', log_message)
-    if m_logger:
-        first_logger = m_logger.group(1).split('.')[-1]
+    # Every pattern below needs a literal "Exception" or "ERROR"; checking for the
+    # substring first skips regex scans that cannot match
+    has_error = "ERROR" in log_message
 
     # Extract exception type
-    exception_pattern = r'(java\.lang\.\w+Exception|com\.nice\.saas\.wfo\.\S+Exception|\w+Exception):\s*(.+?)(?:\n|$)'
-    exception_match = re.search(exception_pattern, log_message)
+    exception_match = _EXCEPTION_RE.search(log_message) if "Exception" in log_message else None
 
     if exception_match:
-        exception_type = exception_match.group(1).split('.')[-1]
+        exception_type = exception_match.group(1).rpartition('.')[2]
         exception_message = exception_match.group(2).strip()
         normalized_message = _normalize_error_message(exception_message)
         location = _extract_error_location(log_message)
@@ -326,9 +370,15 @@ def _extract_error_signature(log_message: str):
         )
 
         if is_generic:
+            # Capture the first log line's logger (the class after ERROR)
+            first_logger = ""
+            m_logger = _ERROR_LOGGER_RE.search(log_message) if has_error else None
+            if m_logger:
+                first_logger = m_logger.group(1).rpartition('.')[2]
+
             # First ERROR line message (after the trailing ] block)
             first_error_line = ""
-            m_msg = re.search(r'\bERROR\b[^\n]*?\]\s+(.+?)(?:\n|$)', log_message)
+            m_msg = _FIRST_ERROR_LINE_RE.search(log_message) if has_error else None
             if m_msg:
                 first_error_line = m_msg.group(1).strip()
 
@@ -347,11 +397,10 @@ def _extract_error_signature(log_message: str):
         return (exception_type, location, signature)
 
     # Fallback to ERROR pattern
-    error_pattern = r'ERROR\s+(\S+)\s+.*?\]\s+(.+?)(?:\n|$)'
-    error_match = re.search(error_pattern, log_message)
+    error_match = _ERROR_LINE_RE.search(log_message) if has_error else None
 
     if error_match:
-        class_name = error_match.group(1).split('.')[-1]
+        class_name = error_match.group(1).rpartition('.')[2]
         error_msg = error_match.group(2).strip()
         normalized_msg = _normalize_error_message(error_msg)
         return ("ERROR", class_name, f"ERROR in {class_name}: {normalized_msg}")
@@ -363,39 +412,30 @@ def _extract_error_signature(log_message: str):
 def _normalize_error_message(message: str) -> str:
     """Normalize error message by removing dynamic data"""
 
-    message = re.sub(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', '[UUID]', message, flags=re.IGNORECASE)
-    message = re.sub(r'\b[0-9a-f]{16}\b', '[HEX-ID]', message)
-    message = re.sub(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z?', '[TIMESTAMP]', message)
-    message = re.sub(r'\d{2}:\d{2}:\d{2}\.\d+', '[TIME]', message)
-    message = re.sub(r"'[0-9]+'" , "'[ID]'", message)
-    message = re.sub(r'\[\w+_\w+_\w+_\w+\d+\]', '[TENANT]', message)
-    message = re.sub(r'BaseSCRRequest\{[^}]+\}', 'BaseSCRRequest{...}', message)
-    message = re.sub(r'RequestedChanges\{[^}]+\}', 'RequestedChanges{...}', message)
-    message = re.sub(r'ActivityChange\{[^}]+\}', 'ActivityChange{...}', message)
-    message = re.sub(r'\[[^\]]{50,}\]', '[...]', message)
-    message = re.sub(r'\b\d{3,}\b', '[NUM]', message)
+    message = _DYNAMIC_TOKEN_RE.sub(lambda m: _DYNAMIC_TOKEN_REPLACEMENTS[m.lastgroup], message)
+    message = _BASE_SCR_REQUEST_RE.sub('BaseSCRRequest{...}', message)
+    message = _REQUESTED_CHANGES_RE.sub('RequestedChanges{...}', message)
+    message = _ACTIVITY_CHANGE_RE.sub('ActivityChange{...}', message)
+    message = _LONG_BRACKET_50_RE.sub('[...]', message)
+    message = _NUM_RE.sub('[NUM]', message)
     message = ' '.join(message.split())
     return message
 
 def _extract_error_location(log_message: str) -> str:
     """Extract error location from log message"""
-    import re
-
-    at_pattern = r'at (com\.nice\.saas\.wfo\.\w+\.[\w\.]+)\.(\w+)\('
-    at_match = re.search(at_pattern, log_message)
+    at_match = _AT_FRAME_RE.search(log_message) if "at com.nice.saas.wfo." in log_message else None
 
     if at_match:
         class_path = at_match.group(1)
         method = at_match.group(2)
-        class_name = class_path.split('.')[-1]
+        class_name = class_path.rpartition('.')[2]
         return f"{class_name}.{method}"
 
-    error_pattern = r'ERROR\s+(com\.nice\.saas\.wfo\.\S+)'
-    error_match = re.search(error_pattern, log_message)
+    error_match = _ERROR_CLASS_RE.search(log_message) if "ERROR" in log_message else None
 
     if error_match:
         class_path = error_match.group(1)
-        class_name = class_path.split('.')[-1]
+        class_name = class_path.rpartition('.')[2]
         return class_name
 
     return "Unknown"
@@ -2,19 +2,41 @@
 import boto3
 import json
 import logging
+import threading
 from .aws_profile_manager import get_profile_manager, AWSProfileManager
 
+# Try to import orjson (optional, faster JSON parsing)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 
 # Get the profile manager instance
 profile_manager = get_profile_manager()
-cloudWatchClient = profile_manager.create_client("cloudwatch",
-                                                purpose=AWSProfileManager.DATA_PROFILE)
+
+# Dashboards do not change during a run; parsed bodies are cached per (name, region)
+# so metric collection and screenshots share one fetch
+_dashboard_cache = {}
+_dashboard_cache_lock = threading.Lock()
 
 def get_dashboard_data(dashboard_name, cw_client=None):
-    """Get dashboard data using the provided client or default global client."""
-    client = cw_client if cw_client is not None else cloudWatchClient
-    response = client.get_dashboard(DashboardName=dashboard_name)
-    return json.loads(response["DashboardBody"])
+    """Get dashboard data using the provided client or the default data-profile client.
+
+    The parsed body is shared between callers and must not be modified.
+    """
+    client = cw_client if cw_client is not None else profile_manager.get_client(
+        "cloudwatch", purpose=AWSProfileManager.DATA_PROFILE)
+    key = (dashboard_name, client.meta.region_name)
+    dashboard = _dashboard_cache.get(key)
+    if dashboard is None:
+        response = client.get_dashboard(DashboardName=dashboard_name)
+        body = response["DashboardBody"]
+        dashboard = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+        with _dashboard_cache_lock:
+            dashboard = _dashboard_cache.setdefault(key, dashboard)
+    return dashboard
 
 
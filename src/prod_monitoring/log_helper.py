@@ -1,5 +1,10 @@
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
 from .csv_helper import save_error_logs
 from .anonymizer import anonymize_log_message
@@ -7,15 +12,42 @@ from .aws_profile_manager import get_profile_manager, AWSProfileManager
 
 # Import configuration settings
 try:
-    from .unified_config import MAX_LOG_ENTRIES
+    from .unified_config import MAX_LOG_ENTRIES, USE_LOGS_INSIGHTS
 except ImportError:
     # Fallback defaults if unified_config is not available
     MAX_LOG_ENTRIES = 10000
+    USE_LOGS_INSIGHTS = False
 
 # Additional settings
 ANONYMIZE_LOGS = True
-LOG_FILTER_PATTERN = 'ERROR -METRICS_AGG'
+# Log entries containing any of these are dropped entirely
+EXCLUDE_LOG_PATTERNS = ('NotificationDispatcherImpl',)
+# Whole-entry exclusions are also applied server-side so excluded events are never
+# transferred; should_exclude_log stays as the client-side safety net
+LOG_FILTER_PATTERN = 'ERROR -METRICS_AGG' + ''.join(f' -{pattern}' for pattern in EXCLUDE_LOG_PATTERNS)
+# Logs Insights equivalent of LOG_FILTER_PATTERN (oldest first, like filter_log_events)
+LOG_INSIGHTS_QUERY = (
+    'fields toMillis(@timestamp) as epochMillis, @message'
+    ' | filter @message like /ERROR/'
+    + ''.join(f' and @message not like /{re.escape(pattern)}/' for pattern in ('METRICS_AGG',) + EXCLUDE_LOG_PATTERNS)
+    + ' | sort @timestamp asc'
+)
+# Logs Insights returns at most 10,000 rows per query
+LOG_INSIGHTS_MAX_ROWS = 10000
+LOG_INSIGHTS_POLL_SECONDS = 1
+# Queries still running after this long are stopped and the collection fails
+LOG_INSIGHTS_TIMEOUT_SECONDS = 300
 MAX_LOG_ITERATIONS = 100
+# filter_log_events returns at most 10,000 events per page
+LOG_PAGE_SIZE = 10000
+# The log time range is split into this many windows that are fetched concurrently
+LOG_FETCH_WINDOWS = 8
+
+# Framework noise: stack lines containing any of these are dropped from log messages.
+# Compiled once into a single alternation so each line is scanned in one pass.
+_NOISE_PATTERNS = ('shared.restclient', 'platform.shared', 'platform.boot', 'java.base',
+                   'org.springframework', 'org.apache', 'jakarta.servlet', 'jdk.internal', 'fasterxml.jackson')
+_NOISE_RE = re.compile("|".join(map(re.escape, _NOISE_PATTERNS)))
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,30 +61,25 @@ def should_exclude_log(message):
     if not message or not message.strip():
         return True
 
-    # Patterns that indicate the entire log entry is useless
-    exclude_patterns = (
-        'NotificationDispatcherImpl',
-    )
-
     # If message contains any exclude pattern, skip entire log entry
-    return any(pattern in message for pattern in exclude_patterns)
+    return any(pattern in message for pattern in EXCLUDE_LOG_PATTERNS)
 
 def clean_log_message(message):
     """Clean log message to prevent CSV formatting issues and filter out framework noise."""
     if not message or not message.strip():
         return ""
     
-    # Define noise patterns to filter out from individual lines
-    noise_patterns = ('shared.restclient', 'platform.shared', 'platform.boot', 'java.base',
-                      'org.springframework', 'org.apache', 'jakarta.servlet', 'jdk.internal', 'fasterxml.jackson')
-    
+    # Single-line messages (the common case) skip the split/loop below
+    if '\n' not in message:
+        return '' if _NOISE_RE.search(message) else ' '.join(message.split())
+
     # Process and filter lines in a single pass
     cleaned_lines = []
+    noise_search = _NOISE_RE.search
     for line in message.split('\n'):
-        stripped = line.strip()
-        if stripped and not any(pattern in line for pattern in noise_patterns):
-            # Normalize whitespace efficiently
-            normalized = ' '.join(line.replace('\r', ' ').replace('\t', ' ').split())
+        if noise_search(line) is None:
+            # Normalize whitespace (split() already breaks on \r and \t)
+            normalized = ' '.join(line.split())
             if normalized:
                 cleaned_lines.append(normalized)
     
@@ -66,28 +93,26 @@ def get_time_range_for_logs(start_time, end_time):
     end_ms = int(end_time.timestamp() * 1000)
     return start_ms, end_ms
 
-def fetch_log_events(logs_client, log_group, start_time, end_time, filter_pattern=None, next_token=None, limit=1000):
-    """Fetch log events from CloudWatch Logs with pagination support."""
-    params = {
-        'logGroupName': log_group,
-        'startTime': start_time,
-        'endTime': end_time,
-        'limit': limit
-    }
-    
-    # Add filter pattern if provided
-    if filter_pattern:
-        params['filterPattern'] = filter_pattern
-    
-    # Add pagination token if provided
-    if next_token:
-        params['nextToken'] = next_token
-    
-    return logs_client.filter_log_events(**params)
+def split_time_range(start_ms, end_ms, parts):
+    """Split an inclusive millisecond range into up to `parts` disjoint inclusive windows."""
+    parts = max(1, min(parts, end_ms - start_ms + 1))
+    edges = [start_ms + (end_ms - start_ms + 1) * i // parts for i in range(parts + 1)]
+    return [(edges[i], edges[i + 1] - 1) for i in range(parts)]
+
+@lru_cache(maxsize=4096)
+def _format_log_second(seconds):
+    """Local-time ISO prefix for a whole second; events cluster, so this is cached."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+
+def format_log_timestamp(timestamp_ms):
+    """Format epoch milliseconds like datetime.fromtimestamp(ms / 1000).isoformat()."""
+    seconds, millis = divmod(timestamp_ms, 1000)
+    if millis:
+        return f"{_format_log_second(seconds)}.{millis:03d}000"
+    return _format_log_second(seconds)
 
 def process_log_events(events):
-    """Process log events and convert to required format, excluding useless entries."""
-    log_rows = []
+    """Yield (timestamp, log_message) rows for log events, excluding useless entries."""
     for event in events:
         # Skip entire log entry if it contains useless patterns
         if should_exclude_log(event['message']):
@@ -100,11 +125,114 @@ def process_log_events(events):
             if ANONYMIZE_LOGS:
                 cleaned_message = anonymize_log_message(cleaned_message)
             
-            log_rows.append({
-                "timestamp": datetime.fromtimestamp(event['timestamp'] / 1000).isoformat(),
-                "log_message": cleaned_message
-            })
-    return log_rows
+            yield (format_log_timestamp(event['timestamp']), cleaned_message)
+
+class _WindowBudget:
+    """Page and entry limits shared by the concurrently fetched time windows.
+
+    Pages are drawn from one max_iterations budget. Only the earliest max_entries
+    rows are kept, so a window stops as soon as it and the windows before it hold
+    that many rows; later windows cannot change the result after that point.
+    """
+
+    def __init__(self, window_count, max_entries, max_iterations):
+        self._lock = threading.Lock()
+        self._counts = [0] * window_count
+        self._max_entries = max_entries
+        self._pages_left = max_iterations
+
+    def _filled_through(self, index):
+        return sum(self._counts[:index + 1]) >= self._max_entries
+
+    def filled_through(self, index):
+        """True once window `index` and the windows before it hold max_entries rows."""
+        with self._lock:
+            return self._filled_through(index)
+
+    def take_page(self, index):
+        """Reserve one page for window `index`; False once it should stop fetching."""
+        with self._lock:
+            if self._pages_left <= 0 or self._filled_through(index):
+                return False
+            self._pages_left -= 1
+            return True
+
+    def return_page(self):
+        with self._lock:
+            self._pages_left += 1
+
+    def add_rows(self, index, count):
+        """Record rows fetched by window `index`; True once it should stop fetching."""
+        with self._lock:
+            self._counts[index] += count
+            return self._filled_through(index)
+
+def _collect_window_logs(logs_client, params, budget, index):
+    """Page through one time window; returns (rows, iterations, truncated).
+
+    `truncated` is True when the shared page budget ran out before the window was
+    fully read (and its rows did not already reach max_entries).
+    """
+    rows = []
+    iteration_count = 0
+    truncated = False
+    # The paginator follows nextToken lazily: each page is requested only after a
+    # page has been reserved from the shared budget
+    pages = iter(logs_client.get_paginator('filter_log_events').paginate(**params))
+    while True:
+        if not budget.take_page(index):
+            truncated = not budget.filled_through(index)
+            break
+        page = next(pages, None)
+        if page is None:
+            budget.return_page()
+            break
+        page_rows = list(process_log_events(page.get('events', [])))
+        rows.extend(page_rows)
+        iteration_count += 1
+
+        if budget.add_rows(index, len(page_rows)):
+            break
+
+        # Log progress every 10 iterations (logging rather than print: windows run in
+        # parallel threads, and the message is only formatted when INFO is enabled)
+        if iteration_count % 10 == 0:
+            logging.info("Processed %d iterations, collected %d log entries", iteration_count, len(rows))
+    return rows, iteration_count, truncated
+
+def _collect_insights_logs(logs_client, log_group, start_ms, end_ms, max_entries):
+    """Run LOG_INSIGHTS_QUERY over the range and return processed rows.
+
+    Raises RuntimeError if the query fails and TimeoutError (after stopping the
+    query) if it has not completed within LOG_INSIGHTS_TIMEOUT_SECONDS.
+    """
+    limit = max(1, min(max_entries, LOG_INSIGHTS_MAX_ROWS))
+    query_id = logs_client.start_query(
+        logGroupName=log_group,
+        startTime=start_ms // 1000,
+        endTime=-(-end_ms // 1000),
+        queryString=f"{LOG_INSIGHTS_QUERY} | limit {limit}",
+    )['queryId']
+
+    deadline = time.monotonic() + LOG_INSIGHTS_TIMEOUT_SECONDS
+    while True:
+        response = logs_client.get_query_results(queryId=query_id)
+        status = response['status']
+        if status == 'Complete':
+            break
+        if status not in ('Scheduled', 'Running'):
+            raise RuntimeError(f"Logs Insights query {query_id} ended with status {status}")
+        if time.monotonic() >= deadline:
+            logs_client.stop_query(queryId=query_id)
+            raise TimeoutError(f"Logs Insights query {query_id} did not complete "
+                               f"within {LOG_INSIGHTS_TIMEOUT_SECONDS} seconds")
+        time.sleep(LOG_INSIGHTS_POLL_SECONDS)
+
+    events = []
+    for result in response['results']:
+        fields = {field['field']: field['value'] for field in result}
+        events.append({'timestamp': int(fields['epochMillis']), 'message': fields.get('@message', '')})
+    return list(process_log_events(events))
 
 def collect_error_logs(log_group, start_time, end_time, region_code, region,
                       filter_pattern=None, max_entries=None, max_iterations=None):
@@ -130,42 +258,67 @@ def collect_error_logs(log_group, start_time, end_time, region_code, region,
     if max_iterations is None:
         max_iterations = MAX_LOG_ITERATIONS
 
-    logs_client = profile_manager.create_client("logs", region_name=region,
-                                               purpose=AWSProfileManager.DATA_PROFILE)
+    logs_client = profile_manager.get_client("logs", region_name=region,
+                                            purpose=AWSProfileManager.DATA_PROFILE)
     start_ms, end_ms = get_time_range_for_logs(start_time, end_time)
-    error_log_rows = []
-    iteration_count = 0
-    
-    try:
-        # Initial request
-        response = fetch_log_events(logs_client, log_group, start_ms, end_ms, filter_pattern)
-        error_log_rows.extend(process_log_events(response.get('events', [])))
-        next_token = response.get('nextToken')
-        iteration_count += 1
-        
-        # Continue pagination if needed
-        while (next_token and 
-               len(error_log_rows) < max_entries and 
-               iteration_count < max_iterations):
-            
-            response = fetch_log_events(logs_client, log_group, start_ms, end_ms, filter_pattern, next_token)
-            error_log_rows.extend(process_log_events(response.get('events', [])))
-            next_token = response.get('nextToken')
-            iteration_count += 1
-            
-            # Log progress every 10 iterations
-            if iteration_count % 10 == 0:
-                print(f"Processed {iteration_count} iterations, collected {len(error_log_rows)} log entries")
-        
-        print(f"Fetched {len(error_log_rows)} error log entries in {iteration_count} iterations.")
-        
-    except Exception as e:
-        logging.error(f"Error fetching logs from {log_group}: {e}")
-        error_log_rows.append({
-            "timestamp": datetime.now().isoformat(),
-            "log_message": f"Log fetch error from {log_group}: {e}"
-        })
-    
-    # Save logs to CSV
-    save_error_logs(error_log_rows, region_code)
-    return len(error_log_rows)
+
+    params = {
+        'logGroupName': log_group,
+        'startTime': start_ms,
+        'endTime': end_ms,
+        'PaginationConfig': {'PageSize': LOG_PAGE_SIZE},
+    }
+    if filter_pattern:
+        params['filterPattern'] = filter_pattern
+
+    # Disjoint windows are paged concurrently (each still walks its own nextToken
+    # chain) and share the page and entry budgets
+    windows = split_time_range(start_ms, end_ms, LOG_FETCH_WINDOWS)
+    budget = _WindowBudget(len(windows), max_entries, max_iterations)
+    collected = 0
+
+    def _stream_rows():
+        """Yield rows window by window so they are written while later windows load."""
+        nonlocal collected
+        iteration_count = 0
+        try:
+            # LOG_INSIGHTS_QUERY only encodes the default filter, so a caller-supplied
+            # pattern is always applied through filter_log_events
+            if USE_LOGS_INSIGHTS and filter_pattern == LOG_FILTER_PATTERN:
+                rows = _collect_insights_logs(logs_client, log_group, start_ms, end_ms, max_entries)
+                collected += len(rows)
+                yield from rows
+                print(f"Fetched {collected} error log entries with a Logs Insights query.")
+                return
+
+            with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+                futures = [
+                    executor.submit(_collect_window_logs, logs_client,
+                                    {**params, 'startTime': window_start, 'endTime': window_end},
+                                    budget, index)
+                    for index, (window_start, window_end) in enumerate(windows)
+                ]
+                # Windows are in time order, so streaming them in order keeps the earliest entries
+                for future in futures:
+                    rows, iterations, truncated = future.result()
+                    iteration_count += iterations
+                    rows = rows[:max_entries - collected]
+                    collected += len(rows)
+                    yield from rows
+                    # Rows of later windows would leave a gap after a window cut short
+                    # by the page budget, so the output ends there
+                    if collected >= max_entries or truncated:
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
+            print(f"Fetched {collected} error log entries in {iteration_count} iterations.")
+
+        except Exception as e:
+            logging.error(f"Error fetching logs from {log_group}: {e}")
+            collected += 1
+            yield (datetime.now().isoformat(), f"Log fetch error from {log_group}: {e}")
+
+    # Save logs to CSV as they arrive
+    save_error_logs(_stream_rows(), region_code)
+    return collected
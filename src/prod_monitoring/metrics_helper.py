@@ -1,12 +1,13 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
 
 from .csv_helper import save_metrics_group_to_csv, OUTPUT_ROOT
 from .log_helper import collect_error_logs
-from .unified_config import SERVICES_METADATA, SERVICES_METADATA_PERF, PERIOD
+from .unified_config import SERVICES_METADATA, SERVICES_METADATA_PERF, PERIOD, MAX_PARALLEL_REGIONS
 from .aws_profile_manager import get_profile_manager, AWSProfileManager
+from .dashboard_helper import get_dashboard_data
 
 
 logging.basicConfig(level=logging.INFO)
@@ -25,8 +26,8 @@ def get_metric_types(service_name):
     }
 
 def make_cloudwatch_client(region_name: str):
-    return profile_manager.create_client("cloudwatch", region_name=region_name,
-                                        purpose=AWSProfileManager.DATA_PROFILE)
+    return profile_manager.get_client("cloudwatch", region_name=region_name,
+                                     purpose=AWSProfileManager.DATA_PROFILE)
 
 
 def get_dashboard(region_dashboard: str, region_name: str):
@@ -36,8 +37,7 @@ def get_dashboard(region_dashboard: str, region_name: str):
     for attempt in range(max_retries):
         try:
             cw = make_cloudwatch_client(region_name)
-            response = cw.get_dashboard(DashboardName=region_dashboard)
-            return json.loads(response["DashboardBody"])
+            return get_dashboard_data(region_dashboard, cw)
 
         except Exception as e:
             error_msg = str(e)
@@ -67,29 +67,82 @@ def get_dashboard(region_dashboard: str, region_name: str):
             raise
 
 
-def get_metrics_data(cw_client, metric_query, start_time, end_time):
-    response = cw_client.get_metric_data(
-        MetricDataQueries=[metric_query],
-        StartTime=start_time,
-        EndTime=end_time,
-        ScanBy="TimestampAscending"
-        # No LabelOptions - uses local timezone by default
-    )
-    return response['MetricDataResults']
+# GetMetricData accepts at most 500 queries per request
+_MAX_QUERIES_PER_REQUEST = 500
+# Upper bound on concurrent GetMetricData requests for one batch of queries
+_MAX_CONCURRENT_METRIC_REQUESTS = 4
 
 
-def get_metrics_with_threshold(cw_client, threshold, query, start_time, end_time):
-    metricsData = get_metrics_data(cw_client, query, start_time, end_time)
+def _fetch_metric_chunk(cw_client, metric_queries, start_time, end_time):
+    """Run one GetMetricData request (<= 500 queries) through the paginator; returns its pages."""
+    paginator = cw_client.get_paginator("get_metric_data")
+    return [
+        page["MetricDataResults"]
+        for page in paginator.paginate(
+            MetricDataQueries=metric_queries,
+            StartTime=start_time,
+            EndTime=end_time,
+            ScanBy="TimestampAscending",
+            # No LabelOptions - uses local timezone by default
+        )
+    ]
+
+
+def get_metrics_data(cw_client, metric_queries, start_time, end_time):
+    """Fetch results for many metric queries with as few GetMetricData calls as possible.
+
+    Queries are sent in chunks of 500 (concurrently when there is more than one) and
+    the paginator follows every NextToken page, so the returned list holds one merged
+    {"Timestamps", "Values"} result per query, in order.
+    """
+    chunks = [metric_queries[start:start + _MAX_QUERIES_PER_REQUEST]
+              for start in range(0, len(metric_queries), _MAX_QUERIES_PER_REQUEST)]
+    if len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_CONCURRENT_METRIC_REQUESTS)) as executor:
+            chunk_pages = list(executor.map(
+                lambda chunk: _fetch_metric_chunk(cw_client, chunk, start_time, end_time), chunks))
+    else:
+        chunk_pages = [_fetch_metric_chunk(cw_client, chunk, start_time, end_time) for chunk in chunks]
+
+    results = {query["Id"]: {"Timestamps": [], "Values": []} for query in metric_queries}
+    for pages in chunk_pages:
+        for page in pages:
+            for result in page:
+                merged = results[result["Id"]]
+                merged["Timestamps"].extend(result["Timestamps"])
+                merged["Values"].extend(result["Values"])
+    return [results[query["Id"]] for query in metric_queries]
+
+
+def _iter_breaches(metric_result, threshold):
+    """Yield (iso timestamp, value) for each datapoint above the threshold."""
+    for timestamp, value in zip(metric_result["Timestamps"], metric_result["Values"]):
+        if value > threshold:
+            yield timestamp.isoformat(), value
+
+
+def _threshold_breaches(metric_result, threshold):
     errorsDict = {}
     errorCount = 0
-    for idx, value in enumerate(metricsData[0]["Values"]):
-        if value > threshold:
-            errorCount += value
-            errorsDict[metricsData[0]["Timestamps"][idx].isoformat()] = value
-    # CSV saving removed; handled in getAllMetricDetails
+    for timestamp, value in _iter_breaches(metric_result, threshold):
+        errorCount += value
+        errorsDict[timestamp] = value
     return errorCount, errorsDict
 
 
+def _iter_group_rows(group_series):
+    """Yield CSV rows for a metric group from its (metric name, threshold, result) series."""
+    for metric_name, threshold, result in group_series:
+        for timestamp, value in _iter_breaches(result, threshold):
+            yield {"metric": metric_name, "timestamp": timestamp, "value": value}
+
+
+def get_metrics_with_threshold(cw_client, threshold, query, start_time, end_time):
+    metricsData = get_metrics_data(cw_client, [query], start_time, end_time)
+    # CSV saving removed; handled in getAllMetricDetails
+    return _threshold_breaches(metricsData[0], threshold)
+
+
 def getMetricsList(dashboard_body, title):
     """Extract full metric definitions from a dashboard widget by title.
 
@@ -102,6 +155,20 @@ def getMetricsList(dashboard_body, title):
     return []
 
 
+def _widget_metrics_by_title(dashboard_body):
+    """Index widget metric definitions by title (first widget wins, as in getMetricsList)."""
+    widget_metrics = {}
+    for widget in dashboard_body["widgets"]:
+        title = widget["properties"].get("title")
+        if title not in widget_metrics:
+            widget_metrics[title] = widget["properties"].get("metrics", [])
+    return widget_metrics
+
+
+# Characters not allowed in a MetricDataQuery Id that are mapped to "_"
+_METRIC_ID_TRANS = str.maketrans({".": "_", "-": "_"})
+
+
 def get_metric_query(metric_def, statType):
     """Build a CloudWatch metric query from a dashboard metric definition.
 
@@ -130,7 +197,7 @@ def get_metric_query(metric_def, statType):
         i += 2
 
     # Generate a unique ID for this metric
-    metric_id = "".join(metric_name.split()).lower().replace(".", "_").replace("-", "_")
+    metric_id = "".join(metric_name.split()).lower().translate(_METRIC_ID_TRANS)
 
     return {
         "Id": metric_id,
@@ -147,33 +214,59 @@ def get_metric_query(metric_def, statType):
     }
 
 
-def process_metric_type(cw_client, dashboard_body, metric_type_key, metric_type_meta, start_time, end_time):
-    """Process a single metric type for a region and return collected data."""
-    # Determine threshold and stat type based on metric name
-    metric_name = metric_type_meta["name"]
+def _threshold_and_stat(metric_name):
+    """Determine threshold and stat type based on metric name."""
     if "Error" in metric_name:
-        threshold = 0
-        statType = "Sum"
-    elif "CPU" in metric_name or "Memory" in metric_name:
+        return 0, "Sum"
+    if "CPU" in metric_name or "Memory" in metric_name:
         # For CPU and Memory, threshold is 70%
-        threshold = 70
-        statType = "Maximum"
-    else:
-        # For Performance metrics, threshold is 500ms
-        threshold = 500
-        statType = "Average"
+        return 70, "Maximum"
+    # For Performance metrics, threshold is 500ms
+    return 500, "Average"
+
 
-    group_data = []
-    for metric_def in getMetricsList(dashboard_body, metric_type_meta["name"]):
-        # Extract the metric name for labeling (it's the second element)
-        metric_name = metric_def[1]
+def process_metric_types(cw_client, dashboard_body, metric_types, start_time, end_time):
+    """Collect data for several metric types of a region with batched GetMetricData calls.
 
-        # Build query with the full metric definition
-        query = get_metric_query(metric_def, statType)
-        _count, errorsDict = get_metrics_with_threshold(cw_client, threshold, query, start_time, end_time)
-        for timestamp, value in errorsDict.items():
-            group_data.append({"metric": metric_name, "timestamp": timestamp, "value": value})
-    return group_data
+    Returns a dict mapping each metric type key to an iterator over its
+    threshold-breaching rows; rows are produced lazily while they are written.
+    """
+    widget_metrics = _widget_metrics_by_title(dashboard_body)
+    queries = []
+    query_index = {}
+    query_meta = []
+    for metric_type_key, metric_type_meta in metric_types.items():
+        threshold, statType = _threshold_and_stat(metric_type_meta["name"])
+        for metric_def in widget_metrics.get(metric_type_meta["name"], []):
+            # Build query with the full metric definition
+            query = get_metric_query(metric_def, statType)
+            metric_stat = query["MetricStat"]
+            metric = metric_stat["Metric"]
+            # The same metric and statistic shown on several widgets is queried once
+            key = (metric["Namespace"], metric["MetricName"],
+                   tuple((d["Name"], d["Value"]) for d in metric["Dimensions"]), metric_stat["Stat"])
+            index = query_index.get(key)
+            if index is None:
+                # Ids derived from the metric name can repeat across dimensions,
+                # so each query in a batch gets its own
+                index = query_index[key] = len(queries)
+                query["Id"] = f"q{index}"
+                queries.append(query)
+            # The metric name for labeling is the second element
+            query_meta.append((metric_type_key, metric_def[1], threshold, index))
+
+    group_series = {metric_type_key: [] for metric_type_key in metric_types}
+    if queries:
+        results = get_metrics_data(cw_client, queries, start_time, end_time)
+        for metric_type_key, metric_name, threshold, index in query_meta:
+            group_series[metric_type_key].append((metric_name, threshold, results[index]))
+    return {metric_type_key: _iter_group_rows(series) for metric_type_key, series in group_series.items()}
+
+
+def process_metric_type(cw_client, dashboard_body, metric_type_key, metric_type_meta, start_time, end_time):
+    """Process a single metric type for a region and return collected data."""
+    return list(process_metric_types(cw_client, dashboard_body, {metric_type_key: metric_type_meta},
+                                     start_time, end_time)[metric_type_key])
 
 
 def collect_metrics_data_for_region(region_code, dashboard_name, region_name, log_group, start_time, end_time, service_name, metric_types, is_perf: bool = False):
@@ -191,11 +284,15 @@ def collect_metrics_data_for_region(region_code, dashboard_name, region_name, lo
     try:
         dashboard_body = get_dashboard(dashboard_name, region_name)
         cw_client = make_cloudwatch_client(region_name)
-        for metric_type_key, meta in metric_types.items():
-            group_data = process_metric_type(cw_client, dashboard_body, metric_type_key, meta, start_time, end_time)
-            save_metrics_group_to_csv(meta['name'], group_data, region=region_rel_folder)
-        # Collect logs
-        collect_error_logs(log_group, start_time, end_time, region_rel_folder, region=region_name, max_entries=10000, max_iterations=100)
+        # Logs and metrics are independent CloudWatch round-trips, so the log
+        # collection runs alongside the metric queries
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            logs_future = executor.submit(collect_error_logs, log_group, start_time, end_time, region_rel_folder,
+                                          region=region_name, max_entries=10000, max_iterations=100)
+            groups = process_metric_types(cw_client, dashboard_body, metric_types, start_time, end_time)
+            for metric_type_key, meta in metric_types.items():
+                save_metrics_group_to_csv(meta['name'], groups[metric_type_key], region=region_rel_folder)
+            logs_future.result()
         print(f"SUCCESS: Collected data for {service_name}/{region_code}")
     except Exception as e:
         error_msg = str(e)
@@ -225,6 +322,7 @@ def getAllMetricDetails(start_time: datetime | None = None, end_time: datetime |
     else:
         selected_services = SERVICES_METADATA_PERF.keys() if is_perf else SERVICES_METADATA.keys()
 
+    region_jobs = []
     for service_name in selected_services:
         # Use the appropriate metadata mapping for validation and lookup
         metadata_map = SERVICES_METADATA_PERF if is_perf else SERVICES_METADATA
@@ -243,4 +341,14 @@ def getAllMetricDetails(start_time: datetime | None = None, end_time: datetime |
                 logging.warning(f"Region code {region_code} not defined for service {service_name}; skipping")
                 continue
             dashboard_name, aws_region, log_group = metadata[region_code]
-            collect_metrics_data_for_region(region_code, dashboard_name, aws_region, log_group, start_time, end_time, service_name, metric_types, is_perf=is_perf)
+            region_jobs.append((region_code, dashboard_name, aws_region, log_group, start_time, end_time, service_name, metric_types))
+
+    if not region_jobs:
+        return
+
+    # Each region writes to its own folder and is dominated by CloudWatch round-trips,
+    # so regions are collected concurrently; results are checked in submission order
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_REGIONS, len(region_jobs)))) as executor:
+        futures = [executor.submit(collect_metrics_data_for_region, *job, is_perf=is_perf) for job in region_jobs]
+        for future in futures:
+            future.result()
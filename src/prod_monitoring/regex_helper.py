@@ -0,0 +1,117 @@
+"""
+Regex engine selection for the log processing hot paths.
+Uses google-re2 (linear-time matching, no catastrophic backtracking) when it is
+installed and falls back to the standard library `re` module otherwise.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Try to import RE2 (optional dependency)
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# ASCII characters matched by Python's \s (RE2's \s omits \v and \x1c-\x1f)
+_ASCII_SPACE_CLASS = r"\t\n\x0b\x0c\r\x1c-\x1f "
+
+
+class _DualPattern:
+    """Compiled pattern that runs on RE2 for ASCII text and on `re` otherwise.
+
+    RE2's \\b, \\d, \\s and \\w are ASCII-only while Python's are Unicode-aware,
+    so only ASCII input (an O(1) check on str) is guaranteed identical results.
+    """
+
+    __slots__ = ("_re2", "_re", "pattern")
+
+    def __init__(self, re2_pattern, re_pattern: re.Pattern[str]):
+        self._re2 = re2_pattern
+        self._re = re_pattern
+        self.pattern = re_pattern.pattern
+
+    def _engine(self, string: str):
+        return self._re2 if string.isascii() else self._re
+
+    def search(self, string: str, *args):
+        return self._engine(string).search(string, *args)
+
+    def match(self, string: str, *args):
+        return self._engine(string).match(string, *args)
+
+    def finditer(self, string: str, *args):
+        return self._engine(string).finditer(string, *args)
+
+    def findall(self, string: str, *args):
+        return self._engine(string).findall(string, *args)
+
+    def sub(self, repl, string: str, count: int = 0):
+        return self._engine(string).sub(repl, string, count)
+
+
+def rewrite_whitespace(pattern: str, space_class: str = _ASCII_SPACE_CLASS) -> str | None:
+    """Rewrite \\s/\\S as explicit classes so other engines match what `re` does.
+
+    Returns None for constructs that cannot be rewritten (\\S inside a class).
+    """
+    out = []
+    in_class = False
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\" and i + 1 < n:
+            esc = pattern[i + 1]
+            if esc == "s":
+                out.append(space_class if in_class else f"[{space_class}]")
+            elif esc == "S":
+                if in_class:
+                    return None
+                out.append(f"[^{space_class}]")
+            else:
+                out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if not in_class and c == "[":
+            # A ']' right after '[' or '[^' is a literal, not the end of the class
+            j = i + 1
+            if j < n and pattern[j] == "^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            out.append(pattern[i:j])
+            in_class = True
+            i = j
+            continue
+        if in_class and c == "]":
+            in_class = False
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    """Compile a pattern with RE2 when possible, otherwise with `re`.
+
+    RE2 rejects lookarounds, backreferences and bounded repeats above 1000, so
+    those patterns (and any flag other than IGNORECASE) transparently use `re`.
+    Both engines expose the same search/sub/finditer/lastgroup API used by callers.
+    """
+    compiled = re.compile(pattern, flags)
+    if not RE2_AVAILABLE or flags & ~re.IGNORECASE:
+        return compiled
+
+    source = rewrite_whitespace(pattern)
+    if source is None:
+        return compiled
+
+    options = re2.Options()
+    options.log_errors = False
+    options.case_sensitive = not flags & re.IGNORECASE
+    try:
+        return _DualPattern(re2.compile(source, options), compiled)
+    except re2.error:
+        return compiled
@@ -1,27 +1,38 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Iterable
 
-from .unified_config import SERVICES_METADATA, SERVICES_METADATA_PERF
+from .unified_config import SERVICES_METADATA, SERVICES_METADATA_PERF, MAX_PARALLEL_REGIONS
 from .dashboard_helper import get_dashboard_data
 from .csv_helper import OUTPUT_ROOT
 from .aws_profile_manager import get_profile_manager, AWSProfileManager
 
+# Try to import orjson (optional, faster JSON serialization)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Get the profile manager instance
 profile_manager = get_profile_manager()
 
 ROOT_DIR = os.path.dirname(__file__)
 GLOBAL_SCREENSHOTS_DIR = os.path.join(ROOT_DIR, 'screenshots')  # legacy root screenshots (kept for backwards comp.)
 os.makedirs(GLOBAL_SCREENSHOTS_DIR, exist_ok=True)
-# Use data profile for CloudWatch access
-cloudwatch_client = profile_manager.create_client("cloudwatch",
-                                                  purpose=AWSProfileManager.DATA_PROFILE)
+# Widget images downloaded concurrently per region
+SCREENSHOT_WORKERS = 8
 
 
-def save_metric_widget_image(widget, metric_name, start_time, end_time, target_dir: str):
+def save_metric_widget_image(widget, metric_name, start_time, end_time, target_dir: str, cw_client=None):
     """
     Saves a CloudWatch metric widget image for the given metric and time range into target_dir.
+    Uses `cw_client` (whose region is also the widget region) or the default client.
     """
+    # Default-region client (data profile) is only created when no client is passed
+    client = cw_client if cw_client is not None else profile_manager.get_client(
+        "cloudwatch", purpose=AWSProfileManager.DATA_PROFILE)
     # Determine statistic type based on metric name
     if "Error" in metric_name:
         statType = "Sum"
@@ -29,20 +40,22 @@ def save_metric_widget_image(widget, metric_name, start_time, end_time, target_d
         statType = "Maximum"
     else:
         statType = "Average"
-    metric_widget_json = json.dumps({
+    metric_widget = {
         "metrics": widget["properties"]["metrics"],
         "view": "timeSeries",
         "stacked": False,
         "stat": statType,
         "period": 300,
-        "region": cloudwatch_client.meta.region_name,
+        "region": client.meta.region_name,
         "title": metric_name,
         "width": 1200,
         "height": 800,
         "start": start_time.strftime("%Y-%m-%dT%H:%M:%S"),
         "end": end_time.strftime("%Y-%m-%dT%H:%M:%S")
-    })
-    response = cloudwatch_client.get_metric_widget_image(MetricWidget=metric_widget_json)
+    }
+    # GetMetricWidgetImage expects the widget definition as a JSON string
+    metric_widget_json = orjson.dumps(metric_widget).decode() if ORJSON_AVAILABLE else json.dumps(metric_widget)
+    response = client.get_metric_widget_image(MetricWidget=metric_widget_json)
     os.makedirs(target_dir, exist_ok=True)
     filename = f"{metric_name}.png"
     filepath = os.path.join(target_dir, filename)
@@ -80,21 +93,31 @@ def save_all_widgets_for_region(region_code: str, service_name: str = "SRA", sta
     dashboard_name, aws_region, _log_group = metadata[region_code]
 
     try:
-        cw_client = profile_manager.create_client("cloudwatch", region_name=aws_region,
-                                                 purpose=AWSProfileManager.DATA_PROFILE)
-        # override global client region for widget generation
-        global cloudwatch_client
-        cloudwatch_client = cw_client
+        # Region-scoped client, shared with the metrics collection path
+        cw_client = profile_manager.get_client("cloudwatch", region_name=aws_region,
+                                              purpose=AWSProfileManager.DATA_PROFILE)
         dashboard = get_dashboard_data(dashboard_name, cw_client)
+        widgets = dashboard.get("widgets", [])
         saved = []
-        for widget in dashboard.get("widgets", []):
-            metric_name = widget["properties"].get("title", "unknown_metric")
-            try:
-                path = save_metric_widget_image(widget, metric_name, start_time, end_time, target_dir=screenshots_dir)
-                saved.append(path)
-            except Exception as e:
-                print(f"Failed to save widget {metric_name} for service {service_name} region {region_code}: {e}")
+        failures = []
+        # Each image is an independent GetMetricWidgetImage round-trip
+        with ThreadPoolExecutor(max_workers=max(1, min(SCREENSHOT_WORKERS, len(widgets)))) as executor:
+            futures = []
+            for widget in widgets:
+                metric_name = widget["properties"].get("title", "unknown_metric")
+                futures.append((metric_name, executor.submit(
+                    save_metric_widget_image, widget, metric_name, start_time, end_time,
+                    target_dir=screenshots_dir, cw_client=cw_client)))
+            for metric_name, future in futures:
+                try:
+                    saved.append(future.result())
+                except Exception as e:
+                    failures.append((metric_name, e))
         print(f"SUCCESS: Saved {len(saved)} screenshots for {service_name}/{region_code}")
+        if failures:
+            # Reported once per region rather than interleaved with other regions' output
+            print(f"Failed to save {len(failures)} widget(s) for service {service_name} region {region_code}:\n"
+                  + "\n".join(f"  {metric_name}: {e}" for metric_name, e in failures))
         return saved
     except Exception as e:
         error_msg = str(e)
@@ -117,6 +140,7 @@ def save_all_widgets_for_all_regions(start_time=None, end_time=None, regions: It
     metadata_map = SERVICES_METADATA_PERF if is_perf else SERVICES_METADATA
     selected_services = services if services else metadata_map.keys()
     results: Dict[str, Dict[str, list[str]]] = {}
+    region_jobs = []
 
     for service_name in selected_services:
         if service_name not in metadata_map:
@@ -131,6 +155,17 @@ def save_all_widgets_for_all_regions(start_time=None, end_time=None, regions: It
             if code not in metadata:
                 print(f"Region {code} not configured for service {service_name}; skipping")
                 continue
-            results[service_name][code] = save_all_widgets_for_region(code, service_name, start_time, end_time, is_perf=is_perf)
+            region_jobs.append((service_name, code))
+
+    if not region_jobs:
+        return results
+
+    # Regions use their own client and screenshot folder, so they are captured concurrently
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_REGIONS, len(region_jobs)))) as executor:
+        futures = [(service_name, code, executor.submit(save_all_widgets_for_region, code, service_name,
+                                                        start_time, end_time, is_perf=is_perf))
+                   for service_name, code in region_jobs]
+        for service_name, code, future in futures:
+            results[service_name][code] = future.result()
 
     return results
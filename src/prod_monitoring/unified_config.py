@@ -71,6 +71,7 @@ IS_PERFORMANCE_MODE = get_bool("IS_PERFORMANCE_MODE", False)
 START_DAYS_BACK = get_int("START_DAYS_BACK", 2)
 END_DAYS_BACK = get_int("END_DAYS_BACK", 1)
 MAX_LOG_ENTRIES = get_int("MAX_LOG_ENTRIES", 10000)
+USE_LOGS_INSIGHTS = get_bool("USE_LOGS_INSIGHTS", False)
 METRIC_PERIOD = get_int("METRIC_PERIOD", 300)
 
 # ============================================================================
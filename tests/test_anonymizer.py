@@ -0,0 +1,75 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.prod_monitoring import anonymizer
+from src.prod_monitoring.anonymizer import anonymize_csv_file, anonymize_log_message
+
+
+def _write_csv(path, messages):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "log_message"])
+        for i, message in enumerate(messages):
+            writer.writerow([f"2024-01-01T00:00:{i % 60:02d}", message])
+
+
+def _read_messages(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [row["log_message"] for row in csv.DictReader(f)]
+
+
+class AnonymizeLogMessageTest(unittest.TestCase):
+
+    def test_lone_surrogate_is_still_redacted(self):
+        # Lone surrogates cannot be UTF-8 encoded for the Hyperscan prefilter
+        self.assertEqual(anonymize_log_message("user \udc80 john@x.com"), "user \udc80 [EMAIL_REDACTED]")
+
+
+class AnonymizeCsvFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp.name, "error_logs.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_known_names_keep_non_name_words(self):
+        _write_csv(self.input_path, [
+            "ERROR job started by userName='admin'",
+            "ERROR job started by userName='system'",
+            "ERROR job started by userName='Alice'",
+            "ERROR admin restarted the system service for Alice",
+        ])
+        output_path = anonymize_csv_file(self.input_path, redact_known_names=True)
+        self.assertEqual(_read_messages(output_path)[-1],
+                         "ERROR admin restarted the system service for [NAME_REDACTED]")
+
+    def test_known_names_off_by_default(self):
+        _write_csv(self.input_path, ["ERROR by userName='Alice'", "ERROR retry for Alice"])
+        output_path = anonymize_csv_file(self.input_path)
+        self.assertEqual(_read_messages(output_path)[-1], "ERROR retry for Alice")
+
+    def test_parallel_output_matches_serial(self):
+        _write_csv(self.input_path, [
+            f"ERROR {i} userName='Bob{i % 3}' from 10.0.0.{i % 256} mail bob{i}@x.com for Carol Jones, tenantId=t{i}"
+            for i in range(200)
+        ])
+        serial_path = os.path.join(self.tmp.name, "serial.csv")
+        parallel_path = os.path.join(self.tmp.name, "parallel.csv")
+        with mock.patch.object(anonymizer, "_CSV_BATCH_ROWS", 7), \
+                mock.patch.object(anonymizer, "_CSV_PARALLEL_MIN_BATCHES", 3):
+            anonymize_csv_file(self.input_path, serial_path, redact_known_names=True)
+            with mock.patch.object(anonymizer, "_anonymize_batches_parallel",
+                                   wraps=anonymizer._anonymize_batches_parallel) as parallel_spy:
+                anonymize_csv_file(self.input_path, parallel_path, redact_known_names=True, workers=2)
+        parallel_spy.assert_called_once()
+        with open(serial_path, encoding="utf-8") as serial, open(parallel_path, encoding="utf-8") as parallel:
+            self.assertEqual(serial.read(), parallel.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from src.prod_monitoring import log_helper
+
+
+class _InsightsClient:
+    """Logs client stub answering get_query_results with a fixed status sequence."""
+
+    def __init__(self, statuses, results=()):
+        self.statuses = list(statuses)
+        self.results = list(results)
+        self.start_query_calls = []
+        self.stopped = []
+
+    def start_query(self, **kwargs):
+        self.start_query_calls.append(kwargs)
+        return {"queryId": "q-1"}
+
+    def get_query_results(self, queryId):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {"status": status, "results": self.results if status == "Complete" else []}
+
+    def stop_query(self, queryId):
+        self.stopped.append(queryId)
+        return {"success": True}
+
+
+class _Paginator:
+
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, **params):
+        self.client.paginate_calls.append(params)
+        return iter([])
+
+
+class _FilterClient:
+    """Logs client stub whose filter_log_events paginator returns no pages."""
+
+    def __init__(self):
+        self.paginate_calls = []
+
+    def get_paginator(self, name):
+        return _Paginator(self)
+
+    def start_query(self, **kwargs):
+        raise AssertionError("Logs Insights must not be used")
+
+
+class _EventsClient:
+    """Logs client stub serving `events` from filter_log_events in pages of `page_size`.
+
+    Like boto3, an empty time window still produces one (empty) page.
+    """
+
+    def __init__(self, events, page_size=10):
+        self.events = events
+        self.page_size = page_size
+        self.pages_served = 0
+
+    def get_paginator(self, name):
+        return self
+
+    def paginate(self, **params):
+        matching = [event for event in self.events
+                    if params["startTime"] <= event["timestamp"] <= params["endTime"]]
+        for i in range(0, max(len(matching), 1), self.page_size):
+            self.pages_served += 1
+            yield {"events": matching[i:i + self.page_size]}
+
+
+def _events(start_ms, end_ms, count):
+    step = (end_ms - start_ms) // count
+    return [{"timestamp": start_ms + i * step, "message": f"ERROR event {start_ms + i * step}"}
+            for i in range(count)]
+
+
+def _insights_row(epoch_millis, message):
+    return [{"field": "epochMillis", "value": str(epoch_millis)}, {"field": "@message", "value": message}]
+
+
+class CollectInsightsLogsTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(log_helper.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_complete_query_returns_processed_rows(self):
+        client = _InsightsClient(["Scheduled", "Running", "Complete"], [
+            _insights_row(1700000000000, "ERROR first failure"),
+            _insights_row(1700000001000, "ERROR NotificationDispatcherImpl noise"),
+        ])
+        rows = log_helper._collect_insights_logs(client, "grp", 1700000000000, 1700000001500, 50)
+
+        self.assertEqual([message for _, message in rows], ["ERROR first failure"])
+        self.assertEqual(client.start_query_calls[0]["startTime"], 1700000000)
+        self.assertEqual(client.start_query_calls[0]["endTime"], 1700000002)
+        self.assertTrue(client.start_query_calls[0]["queryString"].endswith("| limit 50"))
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_failed_query_raises(self):
+        client = _InsightsClient(["Running", "Failed"])
+        with self.assertRaises(RuntimeError):
+            log_helper._collect_insights_logs(client, "grp", 0, 1000, 10)
+        self.assertEqual(client.stopped, [])
+
+    def test_timed_out_query_is_stopped(self):
+        client = _InsightsClient(["Running"])
+        with mock.patch.object(log_helper, "LOG_INSIGHTS_TIMEOUT_SECONDS", 0):
+            with self.assertRaises(TimeoutError):
+                log_helper._collect_insights_logs(client, "grp", 0, 1000, 10)
+        self.assertEqual(client.stopped, ["q-1"])
+
+
+class CollectErrorLogsTest(unittest.TestCase):
+
+    def _collect(self, client, **kwargs):
+        saved = []
+        with mock.patch.object(log_helper, "profile_manager") as profile_manager, \
+                mock.patch.object(log_helper, "save_error_logs", lambda rows, region_code: saved.extend(rows)), \
+                mock.patch.object(log_helper, "USE_LOGS_INSIGHTS", True):
+            profile_manager.get_client.return_value = client
+            collected = log_helper.collect_error_logs("grp", datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 1, 1, 0),
+                                                      "NA1", "us-west-2", **kwargs)
+        return collected, saved
+
+    def test_custom_filter_pattern_skips_insights(self):
+        client = _FilterClient()
+        collected, saved = self._collect(client, filter_pattern="WARN")
+
+        self.assertEqual((collected, saved), (0, []))
+        self.assertEqual({params["filterPattern"] for params in client.paginate_calls}, {"WARN"})
+
+
+class CollectWindowedLogsTest(unittest.TestCase):
+    """filter_log_events path: windows fetched concurrently with shared budgets."""
+
+    start = datetime(2024, 1, 1, 0, 0)
+    end = datetime(2024, 1, 1, 1, 0)
+
+    def setUp(self):
+        self.start_ms, self.end_ms = log_helper.get_time_range_for_logs(self.start, self.end)
+        self.windows = log_helper.split_time_range(self.start_ms, self.end_ms, log_helper.LOG_FETCH_WINDOWS)
+
+    def _collect(self, client, **kwargs):
+        saved = []
+        with mock.patch.object(log_helper, "profile_manager") as profile_manager, \
+                mock.patch.object(log_helper, "save_error_logs", lambda rows, region_code: saved.extend(rows)), \
+                mock.patch.object(log_helper, "USE_LOGS_INSIGHTS", False):
+            profile_manager.get_client.return_value = client
+            collected = log_helper.collect_error_logs("grp", self.start, self.end, "NA1", "us-west-2", **kwargs)
+        self.assertEqual(collected, len(saved))
+        return [message for _, message in saved]
+
+    def test_entry_cap_keeps_earliest_entries(self):
+        events = [event for window_start, window_end in self.windows
+                  for event in _events(window_start, window_end, 40)]
+        client = _EventsClient(events)
+
+        messages = self._collect(client, max_entries=25)
+
+        self.assertEqual(messages, [event["message"] for event in events[:25]])
+        # The first window stops once it alone holds max_entries rows
+        self.assertLess(client.pages_served, len(events) // client.page_size)
+
+    def test_page_budget_exhausted_mid_window_ends_output(self):
+        (first_start, first_end), (second_start, second_end) = log_helper.split_time_range(
+            self.start_ms, self.end_ms, 2)
+        first_events = _events(first_start, first_end, 50)
+        client = _EventsClient(first_events + _events(second_start, second_end, 5))
+
+        with mock.patch.object(log_helper, "LOG_FETCH_WINDOWS", 2):
+            messages = self._collect(client, max_iterations=3)
+
+        # Only the first window's rows are kept, and only the pages it was
+        # allowed to fetch; the later window's rows would leave a gap
+        self.assertTrue(0 < len(messages) < len(first_events))
+        self.assertEqual(messages, [event["message"] for event in first_events[:len(messages)]])
+
+    def test_empty_windows_are_skipped(self):
+        events = _events(*self.windows[2], 15) + _events(*self.windows[5], 3)
+        client = _EventsClient(events)
+
+        messages = self._collect(client)
+
+        self.assertEqual(messages, [event["message"] for event in events])
+        # One page for each empty window, two for the third and one for the sixth
+        self.assertEqual(client.pages_served, len(self.windows) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()